@@ -0,0 +1,85 @@
+"""Checksum validators for numeric PII candidates.
+
+The functions are compiled to native code with Numba when it is installed and
+otherwise run as plain Python over the digit bytes. Inputs are ASCII digit
+buffers; wrap them with ``as_digit_buffer`` before calling.
+"""
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = None
+    njit = None
+
+
+# Verhoeff tables, flattened row by row for single-index lookups
+VERHOEFF_MULTIPLICATION = bytes((
+    0, 1, 2, 3, 4, 5, 6, 7, 8, 9,
+    1, 2, 3, 4, 0, 6, 7, 8, 9, 5,
+    2, 3, 4, 0, 1, 7, 8, 9, 5, 6,
+    3, 4, 0, 1, 2, 8, 9, 5, 6, 7,
+    4, 0, 1, 2, 3, 9, 5, 6, 7, 8,
+    5, 9, 8, 7, 6, 0, 4, 3, 2, 1,
+    6, 5, 9, 8, 7, 1, 0, 4, 3, 2,
+    7, 6, 5, 9, 8, 2, 1, 0, 4, 3,
+    8, 7, 6, 5, 9, 3, 2, 1, 0, 4,
+    9, 8, 7, 6, 5, 4, 3, 2, 1, 0,
+))
+
+VERHOEFF_PERMUTATION = bytes((
+    0, 1, 2, 3, 4, 5, 6, 7, 8, 9,
+    1, 5, 7, 6, 2, 8, 3, 0, 9, 4,
+    5, 8, 0, 3, 7, 9, 6, 1, 4, 2,
+    8, 9, 1, 6, 0, 4, 3, 5, 2, 7,
+    9, 4, 5, 3, 1, 2, 6, 8, 7, 0,
+    4, 2, 8, 6, 5, 7, 3, 9, 0, 1,
+    2, 7, 9, 3, 8, 0, 6, 4, 1, 5,
+    7, 0, 4, 6, 9, 1, 3, 2, 5, 8,
+))
+
+# Luhn doubling with the digit sum already applied: d -> 2d, or 2d - 9 above 9
+LUHN_DOUBLE = bytes((0, 2, 4, 6, 8, 1, 3, 5, 7, 9))
+
+if njit is not None:
+    # Numba treats global arrays as compile-time constants
+    VERHOEFF_MULTIPLICATION = np.frombuffer(VERHOEFF_MULTIPLICATION, dtype=np.uint8)
+    VERHOEFF_PERMUTATION = np.frombuffer(VERHOEFF_PERMUTATION, dtype=np.uint8)
+    LUHN_DOUBLE = np.frombuffer(LUHN_DOUBLE, dtype=np.uint8)
+
+
+def _compile(func):
+    """JIT-compile with Numba when available."""
+    if njit is None:
+        return func
+    return njit(cache=True)(func)
+
+
+def as_digit_buffer(digits):
+    """Wrap ASCII digit bytes in the buffer type the validators expect."""
+    if njit is None:
+        return digits
+    return np.frombuffer(digits, dtype=np.uint8)
+
+
+@_compile
+def luhn(digits):
+    """Return True if the digits pass the Luhn check."""
+    total = 0
+    n = len(digits)
+    for i in range(n):
+        digit = digits[n - 1 - i] - 48
+        if i % 2 == 1:
+            total += LUHN_DOUBLE[digit]
+        else:
+            total += digit
+    return total % 10 == 0
+
+
+@_compile
+def verhoeff(digits):
+    """Return True if the digits pass the Verhoeff check."""
+    checksum = 0
+    n = len(digits)
+    for i in range(n):
+        checksum = VERHOEFF_MULTIPLICATION[checksum * 10 + VERHOEFF_PERMUTATION[(i % 8) * 10 + digits[n - 1 - i] - 48]]
+    return checksum == 0
@@ -1,33 +1,88 @@
 import re
 import json
 import os
+import shutil
 import sys
+import argparse
+import bisect
 import fitz  # PyMuPDF
 import pytesseract
-from PIL import Image
+from PIL import Image, ImageDraw
 import ocrmypdf
 import spacy
 from datetime import datetime
 import logging
 import hashlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import docx
 from docx.shared import RGBColor
 import pandas as pd
 from openpyxl import load_workbook
 from openpyxl.styles import PatternFill
-import io
+
+from _pii_numerics import as_digit_buffer, luhn, verhoeff
+
+try:
+    import re2  # google-re2: linear-time matching for the master scanner
+except ImportError:
+    re2 = None
+
+try:
+    import hyperscan  # SIMD multi-pattern matching used to screen PII types
+except ImportError:
+    hyperscan = None
+
+try:
+    import ahocorasick  # pyahocorasick: one-pass keyword screening
+except ImportError:
+    ahocorasick = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# LSTM engine, single uniform text block
+TESSERACT_CONFIG = "--oem 1 --psm 6"
+
+# ASCII characters that re's \s matches in str patterns but RE2's and
+# Hyperscan's \s do not
+_RE_ONLY_SPACES = re.compile(r'[\x0b\x1c-\x1f]')
+
+SUPPORTED_FORMATS = [".pdf", ".docx", ".doc", ".txt", ".xlsx", ".xls", ".png", ".jpg", ".jpeg", ".tiff", ".bmp"]
+
+
+def _ocr_page(page):
+    """OCR a single PyMuPDF page."""
+    # Hand the raw RGB samples straight to PIL instead of a PNG encode/decode round-trip
+    pix = page.get_pixmap(alpha=False)
+    img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+    return pytesseract.image_to_string(img, config=TESSERACT_CONFIG)
+
+
+def _ocr_pdf_page(args):
+    """OCR a single PDF page. Runs in a worker process, so it reopens the PDF itself."""
+    pdf_path, page_index = args
+    doc = fitz.open(pdf_path)
+    try:
+        return page_index, _ocr_page(doc[page_index])
+    finally:
+        doc.close()
+
+
 class AdvancedPIIRedactor:
+    _nlp_cache = None
+    
     def __init__(self, config_path=None):
         """Initialize the PII redactor with advanced patterns and NLP model."""
         self.config = self._load_config(config_path)
         self.nlp = self._load_nlp_model()
         self.patterns = self._get_advanced_patterns()
+        self._master_cache = OrderedDict()
+        self._prefilter_automaton = self._build_prefilter_automaton()
+        self._hs_db, self._hs_types = self._build_hyperscan_database()
+        self._entity_cache = OrderedDict()
         self.redaction_log = []
         
     def _load_config(self, config_path):
@@ -38,7 +93,7 @@ class AdvancedPIIRedactor:
             "temp_dir": "temp_files",
             "confidence_threshold": 0.8,
             "redaction_color": (0, 0, 0),  # Black
-            "supported_formats": [".pdf", ".docx", ".doc", ".txt", ".xlsx", ".xls", ".png", ".jpg", ".jpeg", ".tiff", ".bmp"]
+            "supported_formats": list(SUPPORTED_FORMATS)
         }
         
         if config_path and os.path.exists(config_path):
@@ -48,10 +103,18 @@ class AdvancedPIIRedactor:
         
         return default_config
     
+    @classmethod
+    def _get_nlp(cls):
+        """Load the spaCy model once per process and share it across instances."""
+        if cls._nlp_cache is None:
+            # Only entities are used, so skip the components NER does not need
+            cls._nlp_cache = spacy.load("en_core_web_sm", disable=["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer"])
+        return cls._nlp_cache
+    
     def _load_nlp_model(self):
         """Load spaCy NLP model for enhanced entity recognition."""
         try:
-            return spacy.load("en_core_web_sm")
+            return self._get_nlp()
         except OSError:
             logger.warning("spaCy model not found. Install with: python -m spacy download en_core_web_sm")
             return None
@@ -61,133 +124,235 @@ class AdvancedPIIRedactor:
         return {
             # Indian Government IDs
             "AADHAAR": {
-                "pattern": r"\b\d{4}[-\s]?\d{4}[-\s]?\d{4}\b",
-                "context": r"(?i)(aadhaar|aadhar|uid|unique.*id)",
+                "pattern": re.compile(r"\b\d{4}[-\s]?\d{4}[-\s]?\d{4}\b", re.IGNORECASE),
+                "context": re.compile(r"(aadhaar|aadhar|uid|unique.*id)", re.IGNORECASE),
                 "validation": self._validate_aadhaar
             },
             "PAN": {
-                "pattern": r"\b[A-Z]{5}\d{4}[A-Z]\b",
-                "context": r"(?i)(pan|permanent.*account|income.*tax)",
+                "pattern": re.compile(r"\b[A-Z]{5}\d{4}[A-Z]\b", re.IGNORECASE),
+                "context": re.compile(r"(pan|permanent.*account|income.*tax)", re.IGNORECASE),
                 "validation": self._validate_pan
             },
             "DRIVING_LICENSE": {
-                "pattern": r"\b[A-Z]{2}[-\s]?\d{2}[-\s]?\d{4}[-\s]?\d{7}\b",
-                "context": r"(?i)(driving|license|dl|motor)",
+                "pattern": re.compile(r"\b[A-Z]{2}[-\s]?\d{2}[-\s]?\d{4}[-\s]?\d{7}\b", re.IGNORECASE),
+                "context": re.compile(r"(driving|license|dl|motor)", re.IGNORECASE),
                 "validation": None
             },
             "PASSPORT": {
-                "pattern": r"\b[A-Z]\d{7}\b",
-                "context": r"(?i)(passport|travel.*document)",
+                "pattern": re.compile(r"\b[A-Z]\d{7}\b", re.IGNORECASE),
+                "context": re.compile(r"(passport|travel.*document)", re.IGNORECASE),
                 "validation": None
             },
             "VOTER_ID": {
-                "pattern": r"\b[A-Z]{3}\d{7}\b",
-                "context": r"(?i)(voter|election|epic)",
+                "pattern": re.compile(r"\b[A-Z]{3}\d{7}\b", re.IGNORECASE),
+                "context": re.compile(r"(voter|election|epic)", re.IGNORECASE),
                 "validation": None
             },
             
             # Financial Information
             "CREDIT_CARD": {
-                "pattern": r"\b(?:\d{4}[-\s]?){3}\d{4}\b",
-                "context": r"(?i)(credit|debit|card|visa|master|amex)",
+                "pattern": re.compile(r"\b(?:\d{4}[-\s]?){3}\d{4}\b", re.IGNORECASE),
+                "context": re.compile(r"(credit|debit|card|visa|master|amex)", re.IGNORECASE),
                 "validation": self._validate_credit_card
             },
             "BANK_ACCOUNT": {
-                "pattern": r"\b\d{9,18}\b",
-                "context": r"(?i)(account|bank|saving|current|ifsc)",
+                # The keyword is part of the pattern, so the digits are the captured group
+                "pattern": re.compile(
+                    r"(?:account|a/c|acct|ifsc|bank)[^\n]{0,40}?\b(\d{9,18})\b"
+                    r"|\b(\d{9,18})\b[^\n]{0,40}?(?:account|a/c|acct)",
+                    re.IGNORECASE
+                ),
+                "prefilter": frozenset({"account", "a/c", "acct", "ifsc", "bank"}),
                 "validation": None
             },
             "IFSC": {
-                "pattern": r"\b[A-Z]{4}0[A-Z0-9]{6}\b",
-                "context": r"(?i)(ifsc|bank.*code|branch.*code)",
+                "pattern": re.compile(r"\b[A-Z]{4}0[A-Z0-9]{6}\b", re.IGNORECASE),
+                "context": re.compile(r"(ifsc|bank.*code|branch.*code)", re.IGNORECASE),
+                "prefilter": frozenset({"ifsc", "bank", "branch"}),
                 "validation": None
             },
             
             # Contact Information
             "MOBILE": {
-                "pattern": r"\b(?:\+91[-\s]?)?\d{10}\b",
-                "context": r"(?i)(mobile|phone|contact|call)",
+                "pattern": re.compile(r"\b(?:\+91[-\s]?)?\d{10}\b", re.IGNORECASE),
+                "context": re.compile(r"(mobile|phone|contact|call)", re.IGNORECASE),
                 "validation": self._validate_mobile
             },
             "EMAIL": {
-                "pattern": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
-                "context": r"(?i)(email|mail|@)",
+                "pattern": re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b", re.IGNORECASE),
+                "context": re.compile(r"(email|mail|@)", re.IGNORECASE),
                 "validation": self._validate_email
             },
             
             # Personal Information
             "DOB": {
-                "pattern": r"\b(?:\d{1,2}[-/]\d{1,2}[-/]\d{2,4}|\d{2,4}[-/]\d{1,2}[-/]\d{1,2})\b",
-                "context": r"(?i)(birth|dob|born|date.*birth)",
+                "pattern": re.compile(r"\b(?:\d{1,2}[-/]\d{1,2}[-/]\d{2,4}|\d{2,4}[-/]\d{1,2}[-/]\d{1,2})\b", re.IGNORECASE),
+                "context": re.compile(r"(birth|dob|born|date.*birth)", re.IGNORECASE),
+                "prefilter": frozenset({"birth", "dob", "born"}),
                 "validation": self._validate_date
             },
             "AGE": {
-                "pattern": r"\b(?:age|aged)?\s*:?\s*(\d{1,3})\s*(?:years?|yrs?|y/o)?\b",
-                "context": r"(?i)(age|years|old)",
+                "pattern": re.compile(r"\b(?:age|aged)?\s*:?\s*\d{1,3}\s*(?:years?|yrs?|y/o)?\b", re.IGNORECASE),
+                "context": re.compile(r"(age|years|old)", re.IGNORECASE),
                 "validation": None
             },
             
             # Address Components
             "PINCODE": {
-                "pattern": r"\b\d{6}\b",
-                "context": r"(?i)(pin|pincode|postal|zip)",
+                "pattern": re.compile(r"\b\d{6}\b", re.IGNORECASE),
+                "context": re.compile(r"(pin|pincode|postal|zip)", re.IGNORECASE),
                 "validation": self._validate_pincode
             },
             "ADDRESS": {
-                "pattern": r"(?i)\b(?:house|flat|plot|door)\s*(?:no\.?|number)?\s*[#]?\s*[\w\d/-]+.*?(?:street|road|lane|colony|nagar|area|layout|complex|apartment|building).*?\b",
-                "context": r"(?i)(address|residence|house|flat|plot)",
+                "pattern": re.compile(r"\b(?:house|flat|plot|door)\s*(?:no\.?|number)?\s*#?\s*[\w/-]{1,20}[^\n]{0,80}?(?:street|road|lane|colony|nagar|area|layout|complex|apartment|building)\b", re.IGNORECASE),
+                "context": re.compile(r"(address|residence|house|flat|plot)", re.IGNORECASE),
+                "prefilter": frozenset({"street", "road", "lane", "colony", "nagar", "area", "layout", "complex", "apartment", "building"}),
                 "validation": None
             },
             
             # Biometric and Health
             "BIOMETRIC_ID": {
-                "pattern": r"\b\d{12,16}\b",
-                "context": r"(?i)(biometric|fingerprint|iris|retina)",
+                "pattern": re.compile(r"\b\d{12,16}\b", re.IGNORECASE),
+                "context": re.compile(r"(biometric|fingerprint|iris|retina)", re.IGNORECASE),
                 "validation": None
             },
             "HEALTH_ID": {
-                "pattern": r"\b\d{2}-\d{4}-\d{4}-\d{4}\b",
-                "context": r"(?i)(health|medical|hospital|abha)",
+                "pattern": re.compile(r"\b\d{2}-\d{4}-\d{4}-\d{4}\b", re.IGNORECASE),
+                "context": re.compile(r"(health|medical|hospital|abha)", re.IGNORECASE),
+                "prefilter": frozenset({"health", "medical", "hospital", "abha"}),
                 "validation": None
             }
         }
     
+    def _build_master_regex(self, pii_types, use_re2=False):
+        """Combine the patterns of the given PII types into one alternation of named groups."""
+        source = "|".join(f"(?P<{pii_type}>{self.patterns[pii_type]['pattern'].pattern})" for pii_type in pii_types)
+        
+        if use_re2:
+            try:
+                return re2.compile(f"(?i){source}".encode())
+            except re2.error as e:
+                logger.debug(f"RE2 cannot compile master pattern, falling back to re: {e}")
+        
+        return re.compile(source, re.IGNORECASE)
+    
+    def _get_master_regex(self, pii_types, use_re2=False):
+        """Return the cached master regex for a tuple of PII types."""
+        key = (pii_types, use_re2)
+        if key in self._master_cache:
+            self._master_cache.move_to_end(key)
+        else:
+            self._master_cache[key] = self._build_master_regex(pii_types, use_re2)
+            if len(self._master_cache) > 32:
+                self._master_cache.popitem(last=False)
+        return self._master_cache[key]
+    
+    def _build_prefilter_automaton(self):
+        """Build an Aho-Corasick automaton mapping prefilter keywords to the PII types they gate."""
+        if ahocorasick is None:
+            return None
+        
+        keyword_types = {}
+        for pii_type, config in self.patterns.items():
+            for keyword in config.get("prefilter", ()):
+                keyword_types.setdefault(keyword, set()).add(pii_type)
+        
+        if not keyword_types:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for keyword, pii_types in keyword_types.items():
+            automaton.add_word(keyword, frozenset(pii_types))
+        automaton.make_automaton()
+        return automaton
+    
+    def _build_hyperscan_database(self):
+        """Compile one Hyperscan expression per PII type, returning (database, pii_types)."""
+        if hyperscan is None:
+            return None, ()
+        
+        flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_ALLOWEMPTY
+        pii_types = []
+        for pii_type, config in self.patterns.items():
+            try:
+                hyperscan.Database().compile(expressions=[config["pattern"].pattern.encode()], flags=[flags])
+            except hyperscan.error as e:
+                logger.debug(f"Hyperscan cannot compile {pii_type} pattern, scanning it with re: {e}")
+                continue
+            pii_types.append(pii_type)
+        
+        if not pii_types:
+            return None, ()
+        
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[self.patterns[pii_type]["pattern"].pattern.encode() for pii_type in pii_types],
+            ids=list(range(len(pii_types))),
+            flags=[flags] * len(pii_types),
+        )
+        return database, tuple(pii_types)
+    
+    def _screen_pii_types(self, text, pii_types):
+        """Drop the PII types whose pattern cannot match anywhere in the text."""
+        if self._hs_db is None or not text.isascii():
+            return pii_types
+        
+        hits = set()
+        
+        def on_match(pattern_id, start, end, flags, context):
+            hits.add(self._hs_types[pattern_id])
+        
+        # Hyperscan's \s misses separators that re's matches, so they are scanned as spaces
+        self._hs_db.scan(_RE_ONLY_SPACES.sub(" ", text).encode("ascii"), match_event_handler=on_match)
+        return tuple(
+            pii_type for pii_type in pii_types
+            if pii_type in hits or pii_type not in self._hs_types
+        )
+    
+    def _active_pii_types(self, text):
+        """Return the PII types worth scanning for in this text."""
+        # Below the 0.7 no-context score a hit needs no keyword, so nothing can be gated
+        if self.config["confidence_threshold"] < 0.7:
+            return tuple(self.patterns)
+        
+        text_lower = text.lower()
+        
+        if self._prefilter_automaton is not None:
+            # Single pass over the text collects every gated type with a keyword hit
+            present = set()
+            for _, pii_types in self._prefilter_automaton.iter(text_lower):
+                present.update(pii_types)
+            return tuple(
+                pii_type for pii_type, config in self.patterns.items()
+                if not config.get("prefilter") or pii_type in present
+            )
+        
+        return tuple(
+            pii_type for pii_type, config in self.patterns.items()
+            if not config.get("prefilter") or any(keyword in text_lower for keyword in config["prefilter"])
+        )
+    
+    def _match_value(self, match):
+        """Return (text, start, end) of the PII value in a match."""
+        for group in range(1, match.re.groups + 1):
+            if match.start(group) != -1:
+                return match.group(group), match.start(group), match.end(group)
+        return match.group(), match.start(), match.end()
+    
+    def _candidate_matches(self, text, start, winner, pii_types):
+        """Yield (pii_type, match) pairs for a master regex hit at ``start``."""
+        for pii_type in pii_types[pii_types.index(winner):]:
+            match = self.patterns[pii_type]["pattern"].match(text, start)
+            if match:
+                yield pii_type, match
+    
     def _validate_aadhaar(self, number):
         """Validate Aadhaar number using Verhoeff algorithm."""
-        digits = re.sub(r'[-\s]', '', number)
-        if len(digits) != 12:
+        digits = re.sub(r'[-\s]', '', number).encode()
+        if len(digits) != 12 or not digits.isdigit():
             return False
         
-        # Verhoeff algorithm implementation
-        multiplication_table = [
-            [0, 1, 2, 3, 4, 5, 6, 7, 8, 9],
-            [1, 2, 3, 4, 0, 6, 7, 8, 9, 5],
-            [2, 3, 4, 0, 1, 7, 8, 9, 5, 6],
-            [3, 4, 0, 1, 2, 8, 9, 5, 6, 7],
-            [4, 0, 1, 2, 3, 9, 5, 6, 7, 8],
-            [5, 9, 8, 7, 6, 0, 4, 3, 2, 1],
-            [6, 5, 9, 8, 7, 1, 0, 4, 3, 2],
-            [7, 6, 5, 9, 8, 2, 1, 0, 4, 3],
-            [8, 7, 6, 5, 9, 3, 2, 1, 0, 4],
-            [9, 8, 7, 6, 5, 4, 3, 2, 1, 0]
-        ]
-        
-        permutation_table = [
-            [0, 1, 2, 3, 4, 5, 6, 7, 8, 9],
-            [1, 5, 7, 6, 2, 8, 3, 0, 9, 4],
-            [5, 8, 0, 3, 7, 9, 6, 1, 4, 2],
-            [8, 9, 1, 6, 0, 4, 3, 5, 2, 7],
-            [9, 4, 5, 3, 1, 2, 6, 8, 7, 0],
-            [4, 2, 8, 6, 5, 7, 3, 9, 0, 1],
-            [2, 7, 9, 3, 8, 0, 6, 4, 1, 5],
-            [7, 0, 4, 6, 9, 1, 3, 2, 5, 8]
-        ]
-        
-        checksum = 0
-        for i, digit in enumerate(reversed(digits)):
-            checksum = multiplication_table[checksum][permutation_table[i % 8][int(digit)]]
-        
-        return checksum == 0
+        return verhoeff(as_digit_buffer(digits))
     
     def _validate_pan(self, pan):
         """Validate PAN format and check digit."""
@@ -197,23 +362,11 @@ class AdvancedPIIRedactor:
     
     def _validate_credit_card(self, number):
         """Validate credit card using Luhn algorithm."""
-        digits = re.sub(r'[-\s]', '', number)
+        digits = re.sub(r'[-\s]', '', number).encode()
         if not digits.isdigit() or len(digits) < 13 or len(digits) > 19:
             return False
         
-        # Luhn algorithm
-        total = 0
-        reverse_digits = digits[::-1]
-        
-        for i, digit in enumerate(reverse_digits):
-            n = int(digit)
-            if i % 2 == 1:
-                n *= 2
-                if n > 9:
-                    n -= 9
-            total += n
-        
-        return total % 10 == 0
+        return luhn(as_digit_buffer(digits))
     
     def _validate_mobile(self, number):
         """Validate Indian mobile number."""
@@ -266,26 +419,37 @@ class AdvancedPIIRedactor:
         """Extract text from PDF with OCR fallback."""
         try:
             doc = fitz.open(pdf_path)
-            text = ""
+            page_texts = []
+            ocr_pages = []
             
             for page in doc:
                 page_text = page.get_text()
                 if page_text.strip():
-                    text += page_text + "\n"
+                    page_texts.append(page_text)
                 else:
-                    # OCR fallback for image-based PDFs
-                    pix = page.get_pixmap()
-                    img_data = pix.tobytes("png")
-                    img = Image.open(io.BytesIO(img_data))
-                    ocr_text = pytesseract.image_to_string(img)
-                    text += ocr_text + "\n"
+                    # OCR fallback for image-based PDFs, done below in parallel
+                    page_texts.append("")
+                    ocr_pages.append(page.number)
             
             doc.close()
-            return text.strip()
+            
+            for page_index, ocr_text in self._ocr_pdf_pages(pdf_path, ocr_pages):
+                page_texts[page_index] = ocr_text
+            
+            return "".join(page_text + "\n" for page_text in page_texts).strip()
         except Exception as e:
             logger.error(f"Error extracting from PDF: {e}")
             return None
     
+    def _ocr_pdf_pages(self, pdf_path, page_indices):
+        """OCR the given PDF pages, spreading them over a process pool when there are several."""
+        tasks = [(pdf_path, page_index) for page_index in page_indices]
+        if len(tasks) <= 1:
+            return [_ocr_pdf_page(task) for task in tasks]
+        
+        with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(tasks))) as executor:
+            return list(executor.map(_ocr_pdf_page, tasks))
+    
     def _extract_from_word(self, doc_path):
         """Extract text from Word documents."""
         try:
@@ -301,12 +465,26 @@ class AdvancedPIIRedactor:
     def _extract_from_excel(self, excel_path):
         """Extract text from Excel files."""
         try:
-            df = pd.read_excel(excel_path, sheet_name=None)
-            text = ""
-            for sheet_name, sheet_data in df.items():
-                text += f"Sheet: {sheet_name}\n"
-                text += sheet_data.to_string(index=False) + "\n\n"
-            return text.strip()
+            if Path(excel_path).suffix.lower() == '.xls':
+                # openpyxl cannot read legacy .xls workbooks
+                df = pd.read_excel(excel_path, sheet_name=None)
+                text = ""
+                for sheet_name, sheet_data in df.items():
+                    text += f"Sheet: {sheet_name}\n"
+                    text += sheet_data.to_string(index=False) + "\n\n"
+                return text.strip()
+            
+            # Stream cell values row by row instead of building DataFrames
+            workbook = load_workbook(excel_path, read_only=True, data_only=True)
+            parts = []
+            for sheet in workbook.worksheets:
+                parts.append(f"Sheet: {sheet.title}\n")
+                for row in sheet.iter_rows(values_only=True):
+                    parts.append(" ".join("" if value is None else str(value) for value in row))
+                    parts.append("\n")
+                parts.append("\n")
+            workbook.close()
+            return "".join(parts).strip()
         except Exception as e:
             logger.error(f"Error extracting from Excel: {e}")
             return None
@@ -336,15 +514,41 @@ class AdvancedPIIRedactor:
         
         detected_pii = {}
         
-        # Pattern-based detection
-        for pii_type, config in self.patterns.items():
-            matches = []
-            pattern_matches = re.finditer(config["pattern"], text, re.IGNORECASE)
+        # Pattern-based detection (single pass over the text). The scan resumes
+        # one character after every hit so that a PII type can still match
+        # inside or across an earlier hit; a value lying entirely within an
+        # accepted value of its own type is skipped, as a per-type scan would
+        # never have reported it, while values of other types are kept.
+        pii_types = self._screen_pii_types(text, self._active_pii_types(text))
+        master_re = None
+        if pii_types:
+            # RE2 scans bytes, where offsets only line up with the text for
+            # ASCII, and its \s misses separators that re's matches
+            use_re2 = re2 is not None and text.isascii() and not _RE_ONLY_SPACES.search(text)
+            master_re = self._get_master_regex(pii_types, use_re2=use_re2)
+            subject = text if isinstance(master_re, re.Pattern) else text.encode("ascii")
+        
+        pos = 0
+        accepted_spans = []
+        while master_re:
+            master_match = master_re.search(subject, pos)
+            if master_match is None:
+                break
+            hit_start = master_match.start()
+            hit_type = master_match.lastgroup
+            if isinstance(hit_type, bytes):
+                hit_type = hit_type.decode()
+            pos = hit_start + 1
+            accepted_spans = [span for span in accepted_spans if span[2] > hit_start]
             
-            for match in pattern_matches:
-                match_text = match.group()
-                match_start = match.start()
-                match_end = match.end()
+            for pii_type, match in self._candidate_matches(text, hit_start, hit_type, pii_types):
+                config = self.patterns[pii_type]
+                match_text, match_start, match_end = self._match_value(match)
+                if any(
+                    accepted_type == pii_type and start <= match_start and match_end <= end
+                    for accepted_type, start, end in accepted_spans
+                ):
+                    continue
                 
                 # Context validation
                 context_score = self._calculate_context_score(text, match_start, match_end, config.get("context", ""))
@@ -356,15 +560,13 @@ class AdvancedPIIRedactor:
                     is_valid = True
                 
                 if is_valid and context_score > self.config["confidence_threshold"]:
-                    matches.append({
+                    detected_pii.setdefault(pii_type, []).append({
                         "text": match_text,
                         "start": match_start,
                         "end": match_end,
                         "confidence": context_score
                     })
-            
-            if matches:
-                detected_pii[pii_type] = matches
+                    accepted_spans.append((pii_type, match_start, match_end))
         
         # NLP-based detection
         if self.nlp:
@@ -378,38 +580,74 @@ class AdvancedPIIRedactor:
         if not context_pattern:
             return 1.0
         
-        # Check surrounding text for context
+        # Check surrounding text for context. A single keyword hit already
+        # saturates the score, so stop at the first one.
         context_window = 100
         context_start = max(0, start - context_window)
         context_end = min(len(text), end + context_window)
-        context_text = text[context_start:context_end]
         
-        context_matches = re.findall(context_pattern, context_text, re.IGNORECASE)
-        return min(1.0, len(context_matches) * 0.3 + 0.7)
+        if context_pattern.search(text, context_start, context_end):
+            return 1.0
+        return 0.7
+    
+    def _chunk_text(self, text, max_chars=1000):
+        """Split text into (offset, chunk) pairs of roughly max_chars at line boundaries."""
+        chunks = []
+        chunk_start = 0
+        chunk_end = 0
+        
+        for line in text.splitlines(keepends=True):
+            if chunk_end > chunk_start and chunk_end - chunk_start + len(line) > max_chars:
+                chunks.append((chunk_start, text[chunk_start:chunk_end]))
+                chunk_start = chunk_end
+            chunk_end += len(line)
+        
+        if chunk_end > chunk_start:
+            chunks.append((chunk_start, text[chunk_start:chunk_end]))
+        
+        return chunks
     
     def _detect_nlp_entities(self, text):
-        """Use NLP for entity detection."""
+        """Use NLP for entity detection, reusing results for text seen recently."""
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        
+        if digest in self._entity_cache:
+            self._entity_cache.move_to_end(digest)
+        else:
+            entities = self._run_nlp(text)
+            if entities is None:
+                return {}
+            self._entity_cache[digest] = entities
+            if len(self._entity_cache) > 128:
+                self._entity_cache.popitem(last=False)
+        
+        return {entity_type: list(matches) for entity_type, matches in self._entity_cache[digest].items()}
+    
+    def _run_nlp(self, text):
+        """Run spaCy NER over the text; returns None if it fails."""
         try:
-            doc = self.nlp(text)
+            chunks = self._chunk_text(text)
+            docs = self.nlp.pipe((chunk for _, chunk in chunks), batch_size=32)
             entities = {}
             
-            for ent in doc.ents:
-                if ent.label_ in ["PERSON", "ORG", "GPE", "MONEY", "DATE"]:
-                    entity_type = f"NLP_{ent.label_}"
-                    if entity_type not in entities:
-                        entities[entity_type] = []
-                    
-                    entities[entity_type].append({
-                        "text": ent.text,
-                        "start": ent.start_char,
-                        "end": ent.end_char,
-                        "confidence": 0.9
-                    })
+            for (offset, _), doc in zip(chunks, docs):
+                for ent in doc.ents:
+                    if ent.label_ in ["PERSON", "ORG", "GPE", "MONEY", "DATE"]:
+                        entity_type = f"NLP_{ent.label_}"
+                        if entity_type not in entities:
+                            entities[entity_type] = []
+                        
+                        entities[entity_type].append({
+                            "text": ent.text,
+                            "start": offset + ent.start_char,
+                            "end": offset + ent.end_char,
+                            "confidence": 0.9
+                        })
             
             return entities
         except Exception as e:
             logger.error(f"Error in NLP detection: {e}")
-            return {}
+            return None
     
     def redact_file(self, input_path, output_path=None):
         """Redact PII from file and return redacted version."""
@@ -447,27 +685,23 @@ class AdvancedPIIRedactor:
         return path.parent / f"{path.stem}_redacted_{timestamp}{extension}"
     
     def _redact_pdf(self, input_path, output_path):
-        """Redact PDF file."""
+        """Redact PDF file, searching every page for every detected string."""
+        # Detect on the whole document, OCR'd pages included, so context and entities span page breaks
         text = self.extract_text_from_file(input_path)
-        pii_data = self.detect_pii(text)
+        pii_data = self.detect_pii(text) if text else {}
         
         if not pii_data:
             # No PII found, copy original
-            import shutil
             shutil.copy2(input_path, output_path)
             return output_path
         
+        # A value may be detected on one page and repeated on another, so search each distinct string everywhere
+        searched_texts = list(dict.fromkeys(match["text"] for matches in pii_data.values() for match in matches))
         doc = fitz.open(input_path)
-        
         for page in doc:
-            page_text = page.get_text()
-            
-            for pii_type, matches in pii_data.items():
-                for match in matches:
-                    search_results = page.search_for(match["text"])
-                    for rect in search_results:
-                        page.add_redact_annot(rect, fill=self.config["redaction_color"])
-            
+            for text in searched_texts:
+                for quad in page.search_for(text, quads=True):
+                    page.add_redact_annot(quad, fill=self.config["redaction_color"])
             page.apply_redactions()
         
         doc.save(output_path, garbage=4, deflate=True)
@@ -476,18 +710,26 @@ class AdvancedPIIRedactor:
         self._log_redaction(input_path, output_path, pii_data)
         return output_path
     
+    def _build_redaction_regex(self, pii_data):
+        """Compile every detected PII string into one alternation, longest first, or None."""
+        terms = sorted({match["text"] for matches in pii_data.values() for match in matches}, key=len, reverse=True)
+        if not terms:
+            return None
+        return re.compile("|".join(map(re.escape, terms)))
+    
     def _redact_word(self, input_path, output_path):
         """Redact Word document."""
         text = self.extract_text_from_file(input_path)
         pii_data = self.detect_pii(text)
         
         doc = docx.Document(input_path)
+        redaction_re = self._build_redaction_regex(pii_data)
         
-        for paragraph in doc.paragraphs:
-            for pii_type, matches in pii_data.items():
-                for match in matches:
-                    if match["text"] in paragraph.text:
-                        paragraph.text = paragraph.text.replace(match["text"], "█" * len(match["text"]))
+        if redaction_re:
+            for paragraph in doc.paragraphs:
+                redacted = redaction_re.sub(lambda m: "█" * len(m.group()), paragraph.text)
+                if redacted != paragraph.text:
+                    paragraph.text = redacted
         
         doc.save(output_path)
         self._log_redaction(input_path, output_path, pii_data)
@@ -501,16 +743,15 @@ class AdvancedPIIRedactor:
         workbook = load_workbook(input_path)
         black_fill = PatternFill(start_color="000000", end_color="000000", fill_type="solid")
         
-        for sheet in workbook.worksheets:
-            for row in sheet.iter_rows():
-                for cell in row:
-                    if cell.value:
-                        cell_text = str(cell.value)
-                        for pii_type, matches in pii_data.items():
-                            for match in matches:
-                                if match["text"] in cell_text:
-                                    cell.value = "REDACTED"
-                                    cell.fill = black_fill
+        redaction_re = self._build_redaction_regex(pii_data)
+        
+        if redaction_re:
+            for sheet in workbook.worksheets:
+                for row in sheet.iter_rows():
+                    for cell in row:
+                        if cell.value and redaction_re.search(str(cell.value)):
+                            cell.value = "REDACTED"
+                            cell.fill = black_fill
         
         workbook.save(output_path)
         self._log_redaction(input_path, output_path, pii_data)
@@ -521,18 +762,26 @@ class AdvancedPIIRedactor:
         text = self.extract_text_from_file(input_path)
         pii_data = self.detect_pii(text)
         
-        redacted_text = text
-        
-        # Sort matches by position (reverse order to maintain positions)
+        # Sort matches by position and rebuild the text in a single pass,
+        # merging overlapping spans so each character is copied once
         all_matches = []
         for pii_type, matches in pii_data.items():
             for match in matches:
                 all_matches.append(match)
         
-        all_matches.sort(key=lambda x: x["start"], reverse=True)
+        all_matches.sort(key=lambda x: (x["start"], -x["end"]))
         
+        parts = []
+        cursor = 0
         for match in all_matches:
-            redacted_text = redacted_text[:match["start"]] + "█" * (match["end"] - match["start"]) + redacted_text[match["end"]:]
+            start = max(match["start"], cursor)
+            if match["end"] <= start:
+                continue
+            parts.append(text[cursor:start])
+            parts.append("█" * (match["end"] - start))
+            cursor = match["end"]
+        parts.append(text[cursor:])
+        redacted_text = "".join(parts)
         
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(redacted_text)
@@ -540,29 +789,60 @@ class AdvancedPIIRedactor:
         self._log_redaction(input_path, output_path, pii_data)
         return output_path
     
+    def _ocr_words(self, img):
+        """OCR an image once and return its text with the span and box of every word."""
+        data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
+        
+        parts = []
+        boxes = []
+        cursor = 0
+        prev_line = None
+        for i, word in enumerate(data["text"]):
+            word = word.strip()
+            if not word:
+                continue
+            line = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            if prev_line is not None:
+                parts.append(" " if line == prev_line else "\n")
+                cursor += 1
+            prev_line = line
+            
+            left, top = data["left"][i], data["top"][i]
+            boxes.append((cursor, cursor + len(word), (left, top, left + data["width"][i], top + data["height"][i])))
+            parts.append(word)
+            cursor += len(word)
+        
+        return "".join(parts), boxes
+    
     def _redact_image(self, input_path, output_path):
-        """Redact image file by converting to PDF and redacting."""
-        # Convert image to PDF first
+        """Redact image file by blacking out the OCR word boxes that hold PII."""
         img = Image.open(input_path)
-        pdf_path = input_path.replace(Path(input_path).suffix, "_temp.pdf")
-        img.convert('RGB').save(pdf_path)
-        
-        # Redact PDF
-        redacted_pdf = self._redact_pdf(pdf_path, pdf_path.replace("_temp.pdf", "_redacted.pdf"))
-        
-        # Convert back to image if needed
-        if Path(output_path).suffix.lower() in ['.png', '.jpg', '.jpeg']:
-            doc = fitz.open(redacted_pdf)
-            page = doc[0]
-            pix = page.get_pixmap()
-            pix.save(output_path)
-            doc.close()
-            os.remove(pdf_path)
-            os.remove(redacted_pdf)
-        else:
-            os.rename(redacted_pdf, output_path)
-            os.remove(pdf_path)
+        img.load()
+        text, boxes = self._ocr_words(img)
+        pii_data = self.detect_pii(text)
         
+        if not pii_data:
+            # No PII found, copy original
+            img.close()
+            shutil.copy2(input_path, output_path)
+            return output_path
+        
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        draw = ImageDraw.Draw(img)
+        
+        # Boxes are in text order, so bisect on their end offsets to find the
+        # first word each match touches and walk forward from there
+        box_ends = [end for _, end, _ in boxes]
+        for matches in pii_data.values():
+            for match in matches:
+                i = bisect.bisect_right(box_ends, match["start"])
+                while i < len(boxes) and boxes[i][0] < match["end"]:
+                    draw.rectangle(boxes[i][2], fill="black")
+                    i += 1
+        
+        img.save(output_path)
+        self._log_redaction(input_path, output_path, pii_data)
         return output_path
     
     def _log_redaction(self, input_path, output_path, pii_data):
@@ -594,14 +874,74 @@ def ensure_proper_extension(file_path):
     return str(path)
 
 
+_worker_redactor = None
+
+
+def _redact_one(input_path):
+    """Redact a single file in a batch worker, returning (input_path, output_path, pii_count)."""
+    global _worker_redactor
+    if _worker_redactor is None:
+        _worker_redactor = AdvancedPIIRedactor()
+    
+    logged = len(_worker_redactor.redaction_log)
+    try:
+        result = _worker_redactor.redact_file(input_path)
+    except Exception as e:
+        logger.error(f"Error redacting {input_path}: {e}")
+        return input_path, None, 0
+    
+    pii_count = sum(log["total_pii_count"] for log in _worker_redactor.redaction_log[logged:])
+    return input_path, str(result), pii_count
+
+
+def expand_inputs(paths):
+    """Expand directories into the supported files they contain."""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(str(p) for p in sorted(path.iterdir()) if p.is_file() and p.suffix.lower() in SUPPORTED_FORMATS)
+        else:
+            files.append(str(path))
+    return files
+
+
+def redact_batch(input_paths):
+    """Redact several files in parallel, one worker process per CPU."""
+    with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(input_paths))) as executor:
+        return list(executor.map(_redact_one, input_paths))
+
+
 def main():
     """Main function for CLI usage."""
-    if len(sys.argv) < 2:
+    parser = argparse.ArgumentParser(description="Detect and redact PII in documents.")
+    parser.add_argument("input_file", nargs="?", help="file to redact")
+    parser.add_argument("output_file", nargs="?", help="where to write the redacted file")
+    parser.add_argument("--inputs", nargs="+", metavar="PATH", help="files or directories to redact in parallel")
+    args = parser.parse_args()
+    
+    if args.inputs:
+        input_files = expand_inputs(args.inputs)
+        if not input_files:
+            logger.error("No supported files found")
+            sys.exit(1)
+        
+        results = redact_batch(input_files)
+        for _, result, _ in results:
+            if result:
+                print(f"Redacted file saved to: {result}")
+        
+        print(f"Total PII instances redacted: {sum(count for _, _, count in results)}")
+        if any(result is None for _, result, _ in results):
+            sys.exit(1)
+        return
+    
+    if not args.input_file:
         print("Usage: python advanced_pii_redactor.py <input_file> [output_file]")
+        print("       python advanced_pii_redactor.py --inputs PATH [PATH ...]")
         sys.exit(1)
     
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else None
+    input_file = args.input_file
+    output_file = args.output_file
     if output_file:
         output_file = ensure_proper_extension(output_file)
     
@@ -620,4 +960,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,40 +1,306 @@
 import re
 import json
 import os
+import shutil
 import sys
 import fitz
 import pytesseract
-from PIL import Image, ImageDraw, ImageFont
-import ocrmypdf
-import spacy
+from PIL import Image, ImageDraw
 from datetime import datetime
 import logging
 import hashlib
+import multiprocessing
 from pathlib import Path
-import docx
-from docx.shared import RGBColor
-import pandas as pd
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill
-import io
-import cv2
 import numpy as np
-from collections import defaultdict
-import base64
-import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+import bisect
+import weakref
+
+# spaCy, OpenCV, python-docx, openpyxl and pandas are imported where they are
+# used, so each run only pays for the libraries its file type needs
+
+try:
+    import hyperscan  # multi-pattern scanning in a single pass
+except ImportError:
+    hyperscan = None
+
+try:
+    import re2  # RE2::Set, the fallback multi-pattern scanner
+except ImportError:
+    re2 = None
+
+try:
+    import ahocorasick  # one pass over the text finds every context keyword
+except ImportError:
+    ahocorasick = None
+
+try:
+    from tesserocr import PyTessBaseAPI, PSM, RIL, iterate_level  # in-process Tesseract, model loaded once
+except ImportError:
+    PyTessBaseAPI = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Separators allowed inside ID and card numbers
+_CLEAN = re.compile(r'[-\s]')
+_MOBILE_CLEAN = re.compile(r'[-\s+]')
+
+# Exact formats checked by the validators
+_PAN_FORMAT = re.compile(r'^[A-Z]{5}\d{4}[A-Z]$')
+_HEALTH_ID_FORMAT = re.compile(r'^\d{2}-\d{4}-\d{4}-\d{4}$')
+
+# Bare digit-run patterns such as \b\d{9,18}\b only ever match a whole run of
+# digits with no word character on either side, so one scan for such runs
+# serves all of them
+_DIGIT_RUN_PATTERN = re.compile(r'\\b\\d\{(\d+)(?:,(\d+))?\}\\b')
+_DIGIT_RUN = re.compile(r'(?<!\w)\d+(?!\w)')
+
+# ASCII characters that re's \s matches in str patterns but the Hyperscan and
+# RE2 screens do not; they are screened as spaces
+_SCREEN_ONLY_SPACES = re.compile(r'[\x0b\x1c-\x1f]')
+
+# Verhoeff tables used by the Aadhaar checksum
+_VERHOEFF_MULTIPLICATION = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8, 9),
+    (1, 2, 3, 4, 0, 6, 7, 8, 9, 5),
+    (2, 3, 4, 0, 1, 7, 8, 9, 5, 6),
+    (3, 4, 0, 1, 2, 8, 9, 5, 6, 7),
+    (4, 0, 1, 2, 3, 9, 5, 6, 7, 8),
+    (5, 9, 8, 7, 6, 0, 4, 3, 2, 1),
+    (6, 5, 9, 8, 7, 1, 0, 4, 3, 2),
+    (7, 6, 5, 9, 8, 2, 1, 0, 4, 3),
+    (8, 7, 6, 5, 9, 3, 2, 1, 0, 4),
+    (9, 8, 7, 6, 5, 4, 3, 2, 1, 0),
+)
+
+_VERHOEFF_PERMUTATION = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8, 9),
+    (1, 5, 7, 6, 2, 8, 3, 0, 9, 4),
+    (5, 8, 0, 3, 7, 9, 6, 1, 4, 2),
+    (8, 9, 1, 6, 0, 4, 3, 5, 2, 7),
+    (9, 4, 5, 3, 1, 2, 6, 8, 7, 0),
+    (4, 2, 8, 6, 5, 7, 3, 9, 0, 1),
+    (2, 7, 9, 3, 8, 0, 6, 4, 1, 5),
+    (7, 0, 4, 6, 9, 1, 3, 2, 5, 8),
+)
+
+# One Verhoeff step as a single lookup:
+# _VERHOEFF_STEP[(i % 8) * 100 + checksum * 10 + digit] == mul[checksum][perm[i % 8][digit]]
+_VERHOEFF_STEP = bytes(
+    _VERHOEFF_MULTIPLICATION[checksum][_VERHOEFF_PERMUTATION[i][digit]]
+    for i in range(8) for checksum in range(10) for digit in range(10)
+)
+
+# Luhn doubling with the digit sum already applied: d -> 2d, or 2d - 9 above 9
+_LUHN_DOUBLE = bytes((0, 2, 4, 6, 8, 1, 3, 5, 7, 9))
+
+# spaCy entity labels reported as PII
+NLP_ENTITY_LABELS = frozenset({"PERSON", "ORG", "GPE", "MONEY", "DATE", "CARDINAL"})
+
+# Entity patterns for the rule-based ("rules") NLP pipeline
+ENTITY_RULER_PATTERNS = [
+    {"label": "PERSON", "pattern": [{"LOWER": {"IN": ["mr", "mr.", "mrs", "mrs.", "ms", "ms.", "dr", "dr.", "shri", "smt", "smt.", "kumari"]}}, {"ORTH": ".", "OP": "?"}, {"IS_TITLE": True, "IS_ALPHA": True, "OP": "+"}]},
+    {"label": "PERSON", "pattern": [{"IS_TITLE": True, "IS_ALPHA": True}, {"IS_TITLE": True, "IS_ALPHA": True}, {"IS_TITLE": True, "IS_ALPHA": True, "OP": "?"}]},
+    {"label": "MONEY", "pattern": [{"LOWER": {"IN": ["rs", "rs.", "inr", "usd", "₹", "$"]}}, {"LIKE_NUM": True}]},
+    {"label": "DATE", "pattern": [
+        {"IS_DIGIT": True, "LENGTH": {"<=": 2}},
+        {"LOWER": {"IN": ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec",
+                          "january", "february", "march", "april", "june", "july", "august", "september",
+                          "october", "november", "december"]}},
+        {"IS_DIGIT": True, "LENGTH": 4},
+    ]},
+]
+
+# File types redact_file handles
+SUPPORTED_FORMATS = (".pdf", ".docx", ".doc", ".txt", ".xlsx", ".xls", ".png", ".jpg", ".jpeg", ".tiff", ".bmp")
+
+# Per-process OCR state, kept across files: the single-block API used for
+# page and image text, and the word-box API
+_worker_state = {}
+
+
+def _ascii_digits(digits):
+    """Return a digit string as ASCII bytes, mapping non-ASCII decimal digits to ASCII."""
+    if not digits.isascii():
+        digits = "".join(str(int(digit)) for digit in digits)
+    return digits.encode("ascii")
+
+
+@lru_cache(maxsize=64)
+def _block(n):
+    """Return the fill for n redacted characters; PII lengths repeat, so fills are shared."""
+    return "█" * n
+
+
+def _term_alternation(terms):
+    """Compile one regex matching any of the given literal strings."""
+    return re.compile("|".join(map(re.escape, terms)))
+
+
+def _open_tess_api(page_layout=False):
+    """Return a tesserocr API for single-block or, with page_layout, automatic segmentation; None to use pytesseract."""
+    if PyTessBaseAPI is None:
+        return None
+    try:
+        return PyTessBaseAPI(psm=PSM.AUTO if page_layout else PSM.SINGLE_BLOCK)
+    except RuntimeError as e:
+        logger.warning(f"tesserocr could not initialise, falling back to pytesseract: {e}")
+        return None
+
+
+def _ocr_image(api, img):
+    """OCR one image with the given tesserocr API, or pytesseract if it is None."""
+    if api is None:
+        return pytesseract.image_to_string(img, config='--psm 6')
+    api.SetImage(img)
+    return api.GetUTF8Text()
+
+
+def _text_api():
+    """Return this process's single-block tesserocr API, created on first use, or None."""
+    if "api" not in _worker_state:
+        _worker_state["api"] = _open_tess_api()
+    return _worker_state["api"]
+
+
+def _ocr_word_boxes(img):
+    """Yield (line, word, (left, top, right, bottom)) for each word Tesseract finds in img."""
+    if "word_api" not in _worker_state:
+        _worker_state["word_api"] = _open_tess_api(page_layout=True)
+    api = _worker_state["word_api"]
+    
+    if api is None:
+        data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
+        for i, word in enumerate(data["text"]):
+            left, top = data["left"][i], data["top"][i]
+            line = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            yield line, word, (left, top, left + data["width"][i], top + data["height"][i])
+        return
+    
+    api.SetImage(img)
+    api.Recognize()
+    iterator = api.GetIterator()
+    if iterator is None:
+        return
+    line = 0
+    for word in iterate_level(iterator, RIL.WORD):
+        if word.IsAtBeginningOf(RIL.TEXTLINE):
+            line += 1
+        box = word.BoundingBox(RIL.WORD)
+        if box is not None:
+            yield line, word.GetUTF8Text(RIL.WORD) or "", box
+
+
+def _init_ocr_worker():
+    """Keep Tesseract single-threaded in pool workers; the pool supplies the parallelism."""
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+def _ocr_pdf_page(args):
+    """Pool worker: render, preprocess and OCR one PDF page with the worker's tesserocr API."""
+    pdf_path, page_num = args
+    doc = fitz.open(pdf_path)
+    try:
+        # Render straight to 8-bit gray (higher resolution) and wrap the raw samples
+        pix = doc[page_num].get_pixmap(matrix=fitz.Matrix(2, 2), colorspace=fitz.csGRAY, alpha=False)
+        img = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width]
+    finally:
+        doc.close()
+    
+    img = AdvancedPIIRedactor._preprocess_image_for_ocr(img)
+    return page_num, _ocr_image(_text_api(), img)
+
+
+
+def _redact_pdf_page(page, rects, color):
+    """Black out the given rects on one PDF page."""
+    for rect in rects:
+        # Create redaction annotation
+        redact_annot = page.add_redact_annot(rect)
+        redact_annot.set_colors(stroke=color)
+        redact_annot.update()
+    
+    # Apply redactions
+    page.apply_redactions()
+
+
+def _redact_pdf_chunk(args):
+    """Pool worker: redact a run of consecutive pages, returning them as a PDF with each page's links."""
+    pdf_path, page_nums, page_rects, color = args
+    doc = fitz.open(pdf_path)
+    try:
+        links = []
+        for page_num, rects in zip(page_nums, page_rects):
+            page = doc[page_num]
+            _redact_pdf_page(page, rects, color)
+            links.append(page.get_links())
+        doc.select(page_nums)
+        return page_nums[0], doc.tobytes(), links
+    finally:
+        doc.close()
+
+@dataclass
+class MatchSet:
+    """Pattern matches of one PII type, stored column by column."""
+    texts: list = field(default_factory=list)
+    starts: list = field(default_factory=list)
+    ends: list = field(default_factory=list)
+    confidences: list = field(default_factory=list)
+    patterns: list = field(default_factory=list)
+    
+    def __len__(self):
+        return len(self.starts)
+    
+    def append(self, text, start, end, confidence, pattern):
+        self.texts.append(text)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.confidences.append(confidence)
+        self.patterns.append(pattern)
+    
+    def take(self, indexes):
+        """Return a new MatchSet holding the matches at the given indexes, in that order."""
+        return MatchSet(
+            [self.texts[i] for i in indexes],
+            [self.starts[i] for i in indexes],
+            [self.ends[i] for i in indexes],
+            [self.confidences[i] for i in indexes],
+            [self.patterns[i] for i in indexes],
+        )
+    
+    def to_dicts(self):
+        """Return the matches in the dict form used throughout the redactor."""
+        return [
+            {"text": text, "start": start, "end": end, "confidence": confidence, "pattern": pattern}
+            for text, start, end, confidence, pattern in zip(self.texts, self.starts, self.ends, self.confidences, self.patterns)
+        ]
+
+
 class AdvancedPIIRedactor:
     def __init__(self, config_path=None):
         """Initialize the PII redactor with comprehensive patterns and NLP model."""
         self.config = self._load_config(config_path)
-        self.nlp = self._load_nlp_model()
         self.patterns = self._get_comprehensive_patterns()
+        self._pattern_index = [(pii_type, pattern) for pii_type, config in self.patterns.items() for pattern in config["patterns"]]
+        self._pattern_scanner, self._scanned_ids = self._build_pattern_scanner()
+        self._digit_run_lengths = self._find_digit_run_patterns()
         self.redaction_log = []
+        self._log_path = Path(self.config["log_path"]) if self.config.get("log_path") else None
+        self._files_logged = 0
+        self._pii_logged = Counter()
+        self._last_log_entry = None
+        self._last_check = None  # what the last _redact_* call removed, see redact_file
+        self._redaction_checks = {}  # output path -> what to verify, see validate_redaction_quality
         self.context_keywords = self._load_context_keywords()
+        self._context_automaton = self._build_context_automaton()
+        self._cache_dir = Path(self.config["cache_dir"]) if self.config.get("cache_dir") else None
+        self._pool = None
+        self._close_pool = None
         
     def _load_config(self, config_path):
         """Load configuration settings."""
@@ -44,8 +310,12 @@ class AdvancedPIIRedactor:
             "temp_dir": "temp_files",
             "confidence_threshold": 0.6,
             "context_window": 150,
+            "cache_dir": None,  # directory for cached text and detections; holds unredacted PII
+            "nlp_pipeline": "model",  # "model" for en_core_web_sm NER, "rules" for the EntityRuler only
+            "log_path": None,  # JSONL file receiving redaction log entries instead of memory
+            "page_workers": None,  # processes for per-page PDF OCR and redaction; None for one per CPU
             "redaction_color": (0, 0, 0),
-            "supported_formats": [".pdf", ".docx", ".doc", ".txt", ".xlsx", ".xls", ".png", ".jpg", ".jpeg", ".tiff", ".bmp"]
+            "supported_formats": list(SUPPORTED_FORMATS)
         }
         
         if config_path and os.path.exists(config_path):
@@ -55,10 +325,24 @@ class AdvancedPIIRedactor:
         
         return default_config
     
+    @cached_property
+    def nlp(self):
+        """spaCy pipeline, loaded on first use so runs that never reach NER skip loading it."""
+        return self._load_nlp_model()
+    
     def _load_nlp_model(self):
         """Load spaCy NLP model for enhanced entity recognition."""
+        import spacy
+        
+        if self.config["nlp_pipeline"] == "rules":
+            # Lightweight pass: rule-based entities only, no statistical model
+            nlp = spacy.blank("en")
+            nlp.add_pipe("entity_ruler").add_patterns(ENTITY_RULER_PATTERNS)
+            return nlp
+        
         try:
-            return spacy.load("en_core_web_sm")
+            # Only entities are used, so skip the components NER does not need
+            return spacy.load("en_core_web_sm", disable=["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer"])
         except OSError:
             logger.warning("spaCy model not found. Using pattern-based detection only.")
             return None
@@ -87,7 +371,7 @@ class AdvancedPIIRedactor:
     
     def _get_comprehensive_patterns(self):
         """Comprehensive PII patterns with enhanced validation."""
-        return {
+        patterns = {
             # Indian Government IDs
             "AADHAAR": {
                 "patterns": [
@@ -263,10 +547,101 @@ class AdvancedPIIRedactor:
                 "priority": 2
             }
         }
+        
+        # Compile once here so detection never goes through the re module cache
+        for config in patterns.values():
+            config["patterns"] = [re.compile(pattern, re.IGNORECASE) for pattern in config["patterns"]]
+        
+        return patterns
+    
+    def _build_pattern_scanner(self):
+        """Compile every pattern into one screening scanner, returning (scanner, ids to pattern indexes) or (None, [])."""
+        if hyperscan is not None:
+            flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_ALLOWEMPTY
+            scanned_ids = []
+            for pattern_id, (pii_type, pattern) in enumerate(self._pattern_index):
+                try:
+                    hyperscan.Database().compile(expressions=[pattern.pattern.encode()], flags=[flags])
+                except hyperscan.error as e:
+                    logger.debug(f"Hyperscan rejected {pii_type} pattern {pattern.pattern!r}: {e}")
+                    continue
+                scanned_ids.append(pattern_id)
+            
+            if scanned_ids:
+                database = hyperscan.Database()
+                database.compile(
+                    expressions=[self._pattern_index[pattern_id][1].pattern.encode() for pattern_id in scanned_ids],
+                    ids=list(range(len(scanned_ids))),
+                    flags=[flags] * len(scanned_ids),
+                )
+                return database, scanned_ids
+        
+        if re2 is not None:
+            options = re2.Options()
+            options.case_sensitive = False
+            pattern_set = re2.Set.SearchSet(options)
+            scanned_ids = []
+            for pattern_id, (pii_type, pattern) in enumerate(self._pattern_index):
+                try:
+                    pattern_set.Add(pattern.pattern)
+                except re2.error as e:
+                    logger.debug(f"RE2 rejected {pii_type} pattern {pattern.pattern!r}: {e}")
+                    continue
+                scanned_ids.append(pattern_id)
+            
+            if scanned_ids:
+                pattern_set.Compile()
+                return pattern_set, scanned_ids
+        
+        return None, []
+    
+    def _find_digit_run_patterns(self):
+        """Map the index of every bare digit-run pattern to its ``(min, max)`` length."""
+        lengths = {}
+        for pattern_id, (pii_type, pattern) in enumerate(self._pattern_index):
+            bounds = _DIGIT_RUN_PATTERN.fullmatch(pattern.pattern)
+            if bounds:
+                low, high = bounds.groups()
+                lengths[pattern_id] = (int(low), int(high or low))
+        return lengths
+    
+    def _iter_pattern_matches(self, pattern_id, pattern, text, digit_runs):
+        """Yield ``(text, start, end)`` for each match, using group 1 when the pattern has one."""
+        if pattern_id in self._digit_run_lengths:
+            low, high = self._digit_run_lengths[pattern_id]
+            for start, end in digit_runs:
+                if low <= end - start <= high:
+                    yield text[start:end], start, end
+            return
+        
+        for match in pattern.finditer(text):
+            group = 1 if match.groups() else 0
+            yield match.group(group), match.start(group), match.end(group)
+    
+    def _matching_pattern_ids(self, text):
+        """Return the indexes of the patterns that need a full ``re`` pass over the text, or None if it cannot be screened."""
+        if self._pattern_scanner is None or not text.isascii():
+            return None
+        
+        unscanned = set(range(len(self._pattern_index))).difference(self._scanned_ids)
+        # The engines' \s misses separators that re's matches, so they are screened as spaces
+        data = _SCREEN_ONLY_SPACES.sub(" ", text).encode("ascii")
+        
+        if hyperscan is not None and isinstance(self._pattern_scanner, hyperscan.Database):
+            hits = set()
+            
+            def on_match(scanner_id, start, end, flags, context):
+                hits.add(scanner_id)
+            
+            self._pattern_scanner.scan(data, match_event_handler=on_match)
+        else:
+            hits = self._pattern_scanner.Match(data) or ()
+        
+        return unscanned.union(self._scanned_ids[scanner_id] for scanner_id in hits)
     
     def _validate_aadhaar(self, number):
         """Enhanced Aadhaar validation with Verhoeff algorithm."""
-        digits = re.sub(r'[-\s]', '', number)
+        digits = _CLEAN.sub('', number)
         if len(digits) != 12 or not digits.isdigit():
             return False
         
@@ -274,41 +649,17 @@ class AdvancedPIIRedactor:
         if digits == '0' * 12 or digits == '1' * 12:
             return False
         
-        # Verhoeff algorithm
-        multiplication_table = [
-            [0, 1, 2, 3, 4, 5, 6, 7, 8, 9],
-            [1, 2, 3, 4, 0, 6, 7, 8, 9, 5],
-            [2, 3, 4, 0, 1, 7, 8, 9, 5, 6],
-            [3, 4, 0, 1, 2, 8, 9, 5, 6, 7],
-            [4, 0, 1, 2, 3, 9, 5, 6, 7, 8],
-            [5, 9, 8, 7, 6, 0, 4, 3, 2, 1],
-            [6, 5, 9, 8, 7, 1, 0, 4, 3, 2],
-            [7, 6, 5, 9, 8, 2, 1, 0, 4, 3],
-            [8, 7, 6, 5, 9, 3, 2, 1, 0, 4],
-            [9, 8, 7, 6, 5, 4, 3, 2, 1, 0]
-        ]
-        
-        permutation_table = [
-            [0, 1, 2, 3, 4, 5, 6, 7, 8, 9],
-            [1, 5, 7, 6, 2, 8, 3, 0, 9, 4],
-            [5, 8, 0, 3, 7, 9, 6, 1, 4, 2],
-            [8, 9, 1, 6, 0, 4, 3, 5, 2, 7],
-            [9, 4, 5, 3, 1, 2, 6, 8, 7, 0],
-            [4, 2, 8, 6, 5, 7, 3, 9, 0, 1],
-            [2, 7, 9, 3, 8, 0, 6, 4, 1, 5],
-            [7, 0, 4, 6, 9, 1, 3, 2, 5, 8]
-        ]
-        
+        # Verhoeff algorithm, one table lookup per digit
         checksum = 0
-        for i, digit in enumerate(reversed(digits)):
-            checksum = multiplication_table[checksum][permutation_table[i % 8][int(digit)]]
+        for i, digit in enumerate(reversed(_ascii_digits(digits))):
+            checksum = _VERHOEFF_STEP[(i % 8) * 100 + checksum * 10 + digit - 48]
         
         return checksum == 0
     
     def _validate_pan(self, pan):
         """Enhanced PAN validation."""
         pan = pan.upper()
-        if not re.match(r'^[A-Z]{5}\d{4}[A-Z]$', pan):
+        if not _PAN_FORMAT.match(pan):
             return False
         
         # Check for invalid patterns
@@ -319,7 +670,7 @@ class AdvancedPIIRedactor:
     
     def _validate_dl(self, dl):
         """Validate driving license format."""
-        dl = re.sub(r'[-\s]', '', dl)
+        dl = _CLEAN.sub('', dl)
         return len(dl) == 15 and dl[:2].isalpha() and dl[2:].isdigit()
     
     def _validate_passport(self, passport):
@@ -332,21 +683,15 @@ class AdvancedPIIRedactor:
     
     def _validate_credit_card(self, number):
         """Enhanced credit card validation using Luhn algorithm."""
-        digits = re.sub(r'[-\s]', '', number)
+        digits = _CLEAN.sub('', number)
         if not digits.isdigit() or len(digits) < 13 or len(digits) > 19:
             return False
         
-        # Luhn algorithm
-        total = 0
-        reverse_digits = digits[::-1]
-        
-        for i, digit in enumerate(reverse_digits):
-            n = int(digit)
-            if i % 2 == 1:
-                n *= 2
-                if n > 9:
-                    n -= 9
-            total += n
+        # Luhn algorithm: digits in odd positions from the right are summed
+        # as they are, the others through the doubling table
+        digits = _ascii_digits(digits)
+        undoubled = digits[-1::-2]
+        total = sum(undoubled) - 48 * len(undoubled) + sum(_LUHN_DOUBLE[digit - 48] for digit in digits[-2::-2])
         
         return total % 10 == 0
     
@@ -356,11 +701,11 @@ class AdvancedPIIRedactor:
     
     def _validate_ifsc(self, ifsc):
         """Validate IFSC code format."""
-        return len(ifsc) == 11 and ifsc[:4].isalpha() and ifsc[4] == '0'
+        return len(ifsc) == 11 and ifsc[4] == '0' and ifsc[:4].isalpha()
     
     def _validate_mobile(self, number):
         """Enhanced mobile number validation."""
-        digits = re.sub(r'[-\s+]', '', number)
+        digits = _MOBILE_CLEAN.sub('', number)
         if digits.startswith('91'):
             digits = digits[2:]
         return len(digits) == 10 and digits[0] in '6789' and digits.isdigit()
@@ -386,7 +731,7 @@ class AdvancedPIIRedactor:
     
     def _validate_pincode(self, pincode):
         """Enhanced pincode validation."""
-        return len(pincode) == 6 and pincode.isdigit() and not pincode.startswith('0')
+        return len(pincode) == 6 and pincode[0] != '0' and pincode.isdigit()
     
     def _validate_address(self, address):
         """Validate address format."""
@@ -403,9 +748,64 @@ class AdvancedPIIRedactor:
     
     def _validate_health_id(self, health_id):
         """Validate health ID format."""
-        return re.match(r'^\d{2}-\d{4}-\d{4}-\d{4}$', health_id) is not None
+        return _HEALTH_ID_FORMAT.match(health_id) is not None
+    
+    @cached_property
+    def _detection_version(self):
+        """Digest of everything that shapes detect_pii output, used in detection cache keys."""
+        settings = {
+            "patterns": [
+                [pii_type, [pattern.pattern for pattern in config["patterns"]], config.get("priority")]
+                for pii_type, config in self.patterns.items()
+            ],
+            "context_keywords": self.context_keywords,
+            "confidence_threshold": self.config["confidence_threshold"],
+            "context_window": self.config["context_window"],
+            "nlp": [self.nlp.meta.get("name"), self.nlp.meta.get("version")] if self.nlp else None,
+            "nlp_pipeline": self.config["nlp_pipeline"],
+            "entity_ruler_patterns": ENTITY_RULER_PATTERNS if self.config["nlp_pipeline"] == "rules" else None,
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()
+    
+    def _read_cache(self, name):
+        """Return the cached entry with the given file name, or None."""
+        try:
+            with open(self._cache_dir / name, 'r', encoding='utf-8', errors='surrogatepass', newline='') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+    
+    def _write_cache(self, name, content):
+        """Store a cache entry, writing to a temp file first so readers never see partial entries."""
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._cache_dir / f"{name}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8', errors='surrogatepass', newline='') as f:
+            f.write(content)
+        os.replace(tmp_path, self._cache_dir / name)
+    
+    def _file_digest(self, file_path):
+        """Return the SHA-256 hex digest of a file's content."""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
     
     def extract_text_from_file(self, file_path):
+        """Enhanced text extraction, cached by file content when a cache directory is configured."""
+        if self._cache_dir is None:
+            return self._extract_text(file_path)
+        
+        cache_name = f"{self._file_digest(file_path)}.txt"
+        
+        text = self._read_cache(cache_name)
+        if text is None:
+            text = self._extract_text(file_path)
+            if text is not None:
+                self._write_cache(cache_name, text)
+        return text
+    
+    def _extract_text(self, file_path):
         """Enhanced text extraction with OCR improvements."""
         file_ext = Path(file_path).suffix.lower()
         
@@ -430,51 +830,82 @@ class AdvancedPIIRedactor:
         """Enhanced PDF text extraction with better OCR."""
         try:
             doc = fitz.open(pdf_path)
-            text = ""
-            
-            for page in doc:
-                # Try direct text extraction first
-                page_text = page.get_text()
-                if page_text.strip():
-                    text += page_text + "\n"
-                else:
-                    # OCR fallback with image preprocessing
-                    pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # Higher resolution
-                    img_data = pix.tobytes("png")
-                    img = Image.open(io.BytesIO(img_data))
-                    
-                    # Preprocess image for better OCR
-                    img = self._preprocess_image_for_ocr(img)
-                    ocr_text = pytesseract.image_to_string(img, config='--psm 6')
-                    text += ocr_text + "\n"
             
+            # Try direct text extraction first; pages without text are OCRed
+            page_texts = [page.get_text() for page in doc]
             doc.close()
-            return text.strip()
+            
+            return self._join_pdf_pages(pdf_path, page_texts)
         except Exception as e:
             logger.error(f"Error extracting from PDF: {e}")
             return None
     
+    def _join_pdf_pages(self, pdf_path, page_texts):
+        """Join a PDF's page texts into the document text, OCRing the pages without a text layer."""
+        page_texts = list(page_texts)
+        ocr_pages = [page_num for page_num, page_text in enumerate(page_texts) if not page_text.strip()]
+        for page_num, ocr_text in self._ocr_pdf_pages(pdf_path, ocr_pages):
+            page_texts[page_num] = ocr_text
+        
+        return "".join(page_text + "\n" for page_text in page_texts).strip()
+    
+    def _page_workers(self, page_count):
+        """Return how many processes to spread page_count PDF pages over."""
+        return min(page_count, self.config.get("page_workers") or os.cpu_count() or 1)
+    
+    def _process_pool(self):
+        """Return the redactor's process pool for page OCR and redaction, started on first use."""
+        if self._pool is None:
+            workers = self.config.get("page_workers") or os.cpu_count() or 1
+            self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_ocr_worker)
+            self._close_pool = weakref.finalize(self, self._pool.shutdown)
+        return self._pool
+    
+    def close(self):
+        """Shut down the worker processes; a later file that needs them starts new ones."""
+        if self._pool is not None:
+            self._close_pool()
+            self._pool = None
+            self._close_pool = None
+    
+    def _ocr_pdf_pages(self, pdf_path, page_nums):
+        """OCR the given PDF pages, yielding (page_num, text) in page order."""
+        workers = self._page_workers(len(page_nums))
+        if workers > 1:
+            yield from self._process_pool().map(_ocr_pdf_page, [(pdf_path, page_num) for page_num in page_nums])
+        else:
+            for page_num in page_nums:
+                yield _ocr_pdf_page((pdf_path, page_num))
+    
     def _extract_from_image(self, img_path):
         """Enhanced image text extraction with preprocessing."""
         try:
             img = Image.open(img_path)
             img = self._preprocess_image_for_ocr(img)
-            return pytesseract.image_to_string(img, config='--psm 6')
+            [text] = self._ocr_images([img])
+            return text
         except Exception as e:
             logger.error(f"Error extracting from image: {e}")
             return None
     
-    def _preprocess_image_for_ocr(self, img):
-        """Preprocess image for better OCR results."""
-        # Convert to RGB if necessary
-        if img.mode != 'RGB':
-            img = img.convert('RGB')
-        
-        # Convert to OpenCV format
-        img_cv = cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
-        
-        # Apply preprocessing
-        gray = cv2.cvtColor(img_cv, cv2.COLOR_BGR2GRAY)
+    def _ocr_images(self, images):
+        """OCR a sequence of images, yielding the text of each in order."""
+        api = _text_api()
+        for img in images:
+            yield _ocr_image(api, img)
+    
+    @staticmethod
+    def _preprocess_image_for_ocr(img):
+        """Preprocess a PIL image or 8-bit grayscale array for better OCR results."""
+        if isinstance(img, np.ndarray):
+            gray = img
+        else:
+            # Grayscale straight from PIL; np.asarray shares the buffer with OpenCV
+            if img.mode != 'L':
+                img = img.convert('L')
+            gray = np.asarray(img)
+        
+        import cv2
         
         # Noise removal
         denoised = cv2.medianBlur(gray, 3)
@@ -488,6 +919,7 @@ class AdvancedPIIRedactor:
     def _extract_from_word(self, doc_path):
         """Extract text from Word documents."""
         try:
+            import docx
             doc = docx.Document(doc_path)
             text = ""
             for paragraph in doc.paragraphs:
@@ -500,6 +932,7 @@ class AdvancedPIIRedactor:
     def _extract_from_excel(self, excel_path):
         """Extract text from Excel files."""
         try:
+            import pandas as pd
             df = pd.read_excel(excel_path, sheet_name=None)
             text = ""
             for sheet_name, sheet_data in df.items():
@@ -520,53 +953,66 @@ class AdvancedPIIRedactor:
             return None
     
     def detect_pii(self, text):
+        """Enhanced PII detection, cached by text and detection settings when a cache directory is configured."""
+        if not text or self._cache_dir is None:
+            return self._detect_pii(text)
+        
+        key = hashlib.sha256(f"{self._detection_version}\0{text}".encode("utf-8", "surrogatepass")).hexdigest()
+        cached = self._read_cache(f"{key}.json")
+        if cached is not None:
+            return json.loads(cached)
+        
+        detected_pii = self._detect_pii(text)
+        self._write_cache(f"{key}.json", json.dumps(detected_pii))
+        return detected_pii
+    
+    def _detect_pii(self, text):
         """Enhanced PII detection with multi-stage approach."""
         if not text:
             return {}
         
         detected_pii = {}
         
-        # Stage 1: Pattern-based detection with context
-        for pii_type, config in self.patterns.items():
-            matches = []
+        # Stage 1: Pattern-based detection with context, running only the
+        # patterns the multi-pattern scan found somewhere in the text
+        candidate_ids = self._matching_pattern_ids(text)
+        keyword_hits = self._find_context_keywords(text)
+        match_sets = {}
+        digit_runs = None
+        
+        for pattern_id, (pii_type, pattern) in enumerate(self._pattern_index):
+            if candidate_ids is not None and pattern_id not in candidate_ids:
+                continue
             
-            for pattern in config["patterns"]:
-                pattern_matches = list(re.finditer(pattern, text, re.IGNORECASE))
-                
-                for match in pattern_matches:
-                    match_text = match.group(1) if match.groups() else match.group()
-                    match_start = match.start(1) if match.groups() else match.start()
-                    match_end = match.end(1) if match.groups() else match.end()
-                    
-                    # Context validation
-                    context_score = self._calculate_context_score(text, match_start, match_end, pii_type)
-                    
-                    # Pattern validation
-                    if config.get("validation"):
-                        try:
-                            is_valid = config["validation"](match_text)
-                        except:
-                            is_valid = False
-                    else:
-                        is_valid = True
-                    
-                    # Priority-based confidence adjustment
-                    priority_boost = (4 - config.get("priority", 3)) * 0.1
-                    final_confidence = min(1.0, context_score + priority_boost)
-                    
-                    if is_valid and final_confidence > self.config["confidence_threshold"]:
-                        matches.append({
-                            "text": match_text,
-                            "start": match_start,
-                            "end": match_end,
-                            "confidence": final_confidence,
-                            "pattern": pattern
-                        })
+            if digit_runs is None and pattern_id in self._digit_run_lengths:
+                digit_runs = [run.span() for run in _DIGIT_RUN.finditer(text)]
             
+            # Per-pattern settings, looked up once rather than per match
+            config = self.patterns[pii_type]
+            validation = config.get("validation")
+            priority_boost = (4 - config.get("priority", 3)) * 0.1
+            threshold = self.config["confidence_threshold"]
+            matches = match_sets.setdefault(pii_type, MatchSet())
+            for match_text, match_start, match_end in self._iter_pattern_matches(pattern_id, pattern, text, digit_runs):
+                # Pattern validation; invalid candidates are never scored
+                if validation:
+                    try:
+                        if not validation(match_text):
+                            continue
+                    except:
+                        continue
+                
+                # Context validation with priority-based confidence adjustment
+                context_score = self._calculate_context_score(text, match_start, match_end, pii_type, keyword_hits)
+                final_confidence = min(1.0, context_score + priority_boost)
+                
+                if final_confidence > threshold:
+                    matches.append(match_text, match_start, match_end, final_confidence, pattern.pattern)
+        
+        for pii_type, matches in match_sets.items():
             if matches:
                 # Remove duplicates and overlapping matches
-                matches = self._remove_overlapping_matches(matches)
-                detected_pii[pii_type] = matches
+                detected_pii[pii_type] = self._remove_overlapping_matches(matches).to_dicts()
         
         # Stage 2: NLP-based detection
         if self.nlp:
@@ -582,20 +1028,73 @@ class AdvancedPIIRedactor:
         
         return detected_pii
     
-    def _calculate_context_score(self, text, start, end, pii_type):
+    def _build_context_automaton(self):
+        """Build an Aho-Corasick automaton over every context keyword, or None without pyahocorasick."""
+        if ahocorasick is None:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for keywords in self.context_keywords.values():
+            for keyword in keywords:
+                automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+    
+    def _find_context_keywords(self, text):
+        """Map each context keyword found in the lowercased text to its sorted ``(starts, ends)`` in text."""
+        text_lower = text.lower()
+        char_index = None
+        # U+0130 lowercases to two characters, so hits are mapped back to the characters they came from
+        if len(text_lower) != len(text):
+            lowered = [char.lower() for char in text]
+            text_lower = "".join(lowered)
+            char_index = [i for i, part in enumerate(lowered) for _ in part]
+        
+        if self._context_automaton is not None:
+            found = ((end_index - len(keyword) + 1, keyword) for end_index, keyword in self._context_automaton.iter(text_lower))
+        else:
+            found = self._scan_context_keywords(text_lower)
+        
+        keyword_hits = {}
+        for start, keyword in found:
+            starts, ends = keyword_hits.setdefault(keyword, ([], []))
+            if char_index is None:
+                starts.append(start)
+                ends.append(start + len(keyword))
+            else:
+                starts.append(char_index[start])
+                ends.append(char_index[start + len(keyword) - 1] + 1)
+        return keyword_hits
+    
+    def _scan_context_keywords(self, text_lower):
+        """Yield ``(start, keyword)`` for every keyword occurrence, keyword by keyword."""
+        for keyword in {keyword for keywords in self.context_keywords.values() for keyword in keywords}:
+            start = text_lower.find(keyword)
+            while start != -1:
+                yield start, keyword
+                start = text_lower.find(keyword, start + 1)
+    
+    def _calculate_context_score(self, text, start, end, pii_type, keyword_hits=None):
         """Enhanced context scoring with keyword matching."""
+        if keyword_hits is None:
+            keyword_hits = self._find_context_keywords(text)
+        
         context_window = self.config["context_window"]
         context_start = max(0, start - context_window)
         context_end = min(len(text), end + context_window)
-        context_text = text[context_start:context_end].lower()
         
         # Check for relevant keywords
         keywords = self.context_keywords.get(pii_type, [])
         keyword_score = 0
         
         for keyword in keywords:
-            if keyword in context_text:
-                keyword_score += 0.2
+            hits = keyword_hits.get(keyword)
+            if hits:
+                # A keyword counts if one occurrence lies entirely inside the window
+                starts, ends = hits
+                i = bisect.bisect_left(starts, context_start)
+                if i < len(starts) and ends[i] <= context_end:
+                    keyword_score += 0.2
         
         # Base score
         base_score = 0.7
@@ -606,44 +1105,69 @@ class AdvancedPIIRedactor:
         return final_score
     
     def _remove_overlapping_matches(self, matches):
-        """Remove overlapping matches, keeping the highest confidence ones."""
+        """Remove overlapping matches from a MatchSet, keeping the highest confidence ones."""
         if not matches:
             return matches
         
-        # Sort by confidence (descending)
-        sorted_matches = sorted(matches, key=lambda x: x["confidence"], reverse=True)
-        
-        filtered_matches = []
-        for match in sorted_matches:
-            is_overlapping = False
-            for existing in filtered_matches:
-                if (match["start"] < existing["end"] and match["end"] > existing["start"]):
-                    is_overlapping = True
-                    break
+        # Sort by confidence (descending); a stable sort keeps ties in match order
+        order = np.argsort(-np.asarray(matches.confidences, dtype=np.float64), kind="stable")
+        starts = matches.starts
+        ends = matches.ends
+        
+        # Kept spans never overlap, so ordered by start their ends are ordered
+        # too, and the only kept span that can overlap a match is the last one
+        # starting before the match ends
+        kept = []
+        kept_starts = []
+        kept_ends = []
+        for index in order.tolist():
+            i = bisect.bisect_left(kept_starts, ends[index])
+            if i and kept_ends[i - 1] > starts[index]:
+                continue
             
-            if not is_overlapping:
-                filtered_matches.append(match)
+            kept.append(index)
+            kept_starts.insert(i, starts[index])
+            kept_ends.insert(i, ends[index])
         
-        return filtered_matches
+        return matches.take(kept)
+    
+    def _chunk_text(self, text, max_chars=5000):
+        """Split text into (offset, chunk) pairs of roughly max_chars at line boundaries."""
+        chunks = []
+        chunk_start = 0
+        chunk_end = 0
+        
+        for line in text.splitlines(keepends=True):
+            if chunk_end > chunk_start and chunk_end - chunk_start + len(line) > max_chars:
+                chunks.append((chunk_start, text[chunk_start:chunk_end]))
+                chunk_start = chunk_end
+            chunk_end += len(line)
+        
+        if chunk_end > chunk_start:
+            chunks.append((chunk_start, text[chunk_start:chunk_end]))
+        
+        return chunks
     
     def _detect_nlp_entities(self, text):
-        """Enhanced NLP entity detection."""
+        """Enhanced NLP entity detection, streaming the text through spaCy in chunks."""
         try:
-            doc = self.nlp(text)
+            chunks = self._chunk_text(text)
+            docs = self.nlp.pipe((chunk for _, chunk in chunks), batch_size=32)
             entities = {}
             
-            for ent in doc.ents:
-                if ent.label_ in ["PERSON", "ORG", "GPE", "MONEY", "DATE", "CARDINAL"]:
-                    entity_type = f"NLP_{ent.label_}"
-                    if entity_type not in entities:
-                        entities[entity_type] = []
-                    
-                    entities[entity_type].append({
-                        "text": ent.text,
-                        "start": ent.start_char,
-                        "end": ent.end_char,
-                        "confidence": 0.8
-                    })
+            for (offset, _), doc in zip(chunks, docs):
+                for ent in doc.ents:
+                    if ent.label_ in NLP_ENTITY_LABELS:
+                        entity_type = f"NLP_{ent.label_}"
+                        if entity_type not in entities:
+                            entities[entity_type] = []
+                        
+                        entities[entity_type].append({
+                            "text": ent.text,
+                            "start": offset + ent.start_char,
+                            "end": offset + ent.end_char,
+                            "confidence": 0.8
+                        })
             
             return entities
         except Exception as e:
@@ -687,7 +1211,7 @@ class AdvancedPIIRedactor:
         
         return text_lower in false_positives.get(pii_type, [])
     
-    def redact_file(self, input_path, output_path=None):
+    def redact_file(self, input_path, output_path=None, validate=False):
         """Enhanced file redaction with perfect masking."""
         if not os.path.exists(input_path):
             raise FileNotFoundError(f"Input file not found: {input_path}")
@@ -697,22 +1221,66 @@ class AdvancedPIIRedactor:
         if not output_path:
             output_path = self._generate_output_path(input_path)
         
+        self._last_check = None
         try:
-            if file_ext == '.pdf':
-                return self._redact_pdf(input_path, output_path)
-            elif file_ext in ['.docx', '.doc']:
-                return self._redact_word(input_path, output_path)
-            elif file_ext in ['.xlsx', '.xls']:
-                return self._redact_excel(input_path, output_path)
-            elif file_ext == '.txt':
-                return self._redact_text(input_path, output_path)
-            elif file_ext in ['.png', '.jpg', '.jpeg', '.tiff', '.bmp']:
-                return self._redact_image(input_path, output_path)
+            if self._cache_dir is not None:
+                result = self._redact_with_cache(input_path, output_path, file_ext)
             else:
-                raise ValueError(f"Unsupported file format for redaction: {file_ext}")
+                result = self._redact_by_type(input_path, output_path, file_ext)
         except Exception as e:
             logger.error(f"Error redacting file: {e}")
             raise
+        finally:
+            check, self._last_check = self._last_check, None
+        
+        # A check left from an earlier redaction to the same path no longer applies
+        self._redaction_checks.pop(str(result), None)
+        if validate and check is not None:
+            self._redaction_checks[str(result)] = check
+        return result
+    
+    def _redact_by_type(self, input_path, output_path, file_ext):
+        """Redact a file with the redactor for its type."""
+        if file_ext == '.pdf':
+            return self._redact_pdf(input_path, output_path)
+        elif file_ext in ['.docx', '.doc']:
+            return self._redact_word(input_path, output_path)
+        elif file_ext in ['.xlsx', '.xls']:
+            return self._redact_excel(input_path, output_path)
+        elif file_ext == '.txt':
+            return self._redact_text(input_path, output_path)
+        elif file_ext in ['.png', '.jpg', '.jpeg', '.tiff', '.bmp']:
+            return self._redact_image(input_path, output_path)
+        else:
+            raise ValueError(f"Unsupported file format for redaction: {file_ext}")
+    
+    def _redact_with_cache(self, input_path, output_path, file_ext):
+        """Redact a file, reusing the stored output for content already redacted with the same settings."""
+        key = hashlib.sha256(
+            f"{self._file_digest(input_path)}\0{self._detection_version}\0{self.config['redaction_color']}".encode("utf-8")
+        ).hexdigest()
+        cached_output = self._cache_dir / f"{key}.redacted{file_ext}"
+        
+        cached_log = self._read_cache(f"{key}.log.json")
+        if cached_log is not None and cached_output.exists():
+            shutil.copyfile(cached_output, output_path)
+            log_entry = json.loads(cached_log)
+            if log_entry is not None:
+                log_entry.update(timestamp=datetime.now().isoformat(), input_file=input_path, output_file=output_path)
+                self._record_log_entry(log_entry)
+                logger.info(f"Redacted {log_entry['total_pii_count']} PII instances from {input_path} (cached)")
+            return output_path
+        
+        self._last_log_entry = None
+        output_path = self._redact_by_type(input_path, output_path, file_ext)
+        log_entry = self._last_log_entry
+        
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._cache_dir / f"{key}.{os.getpid()}.tmp"
+        shutil.copyfile(output_path, tmp_path)
+        os.replace(tmp_path, cached_output)
+        self._write_cache(f"{key}.log.json", json.dumps(log_entry, default=str))
+        return output_path
     
     def _generate_output_path(self, input_path):
         """Generate output path for redacted file."""
@@ -723,78 +1291,249 @@ class AdvancedPIIRedactor:
     
     def _redact_pdf(self, input_path, output_path):
         """Enhanced PDF redaction with precise positioning."""
-        text = self.extract_text_from_file(input_path)
-        pii_data = self.detect_pii(text)
-        
-        if not pii_data:
-            import shutil
-            shutil.copy2(input_path, output_path)
-            return output_path
-        
         doc = fitz.open(input_path)
-        
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            page_text = page.get_text()
+        try:
+            # One rawdict pass per page gives both the text PII is detected in,
+            # which matches page.get_text(), and where each character sits
+            page_indexes = [self._page_char_index(page) for page in doc]
+            page_texts = [page_text for page_text, _ in page_indexes]
+            try:
+                text = self._join_pdf_pages(input_path, page_texts)
+            except Exception as e:
+                # The text layer can still be redacted without the scanned pages
+                logger.error(f"Error running OCR on PDF pages: {e}")
+                text = "".join(page_text + "\n" for page_text in page_texts).strip()
+            pii_data = self.detect_pii(text)
             
-            # Get text blocks with positions
-            blocks = page.get_text("dict")
+            if not pii_data:
+                shutil.copy2(input_path, output_path)
+                self._last_check = ("terms", [])
+                return output_path
             
-            for pii_type, matches in pii_data.items():
-                for match in matches:
-                    match_text = match["text"]
-                    
-                    # Find text instances on page
-                    text_instances = page.search_for(match_text)
-                    
-                    for rect in text_instances:
-                        # Create redaction annotation
-                        redact_annot = page.add_redact_annot(rect)
-                        redact_annot.set_colors(stroke=self.config["redaction_color"])
-                        redact_annot.update()
+            # Each distinct PII string is located once per page
+            match_texts = list(dict.fromkeys(match["text"] for matches in pii_data.values() for match in matches))
+            color = self.config["redaction_color"]
             
-            # Apply redactions
-            page.apply_redactions()
-        
-        doc.save(output_path, garbage=4, deflate=True)
-        doc.close()
+            found = set()
+            page_rects = []
+            for page_text, char_boxes in page_indexes:
+                rects = []
+                for match_text in match_texts:
+                    for rect in self._find_text_rects(page_text, char_boxes, match_text):
+                        rects.append(tuple(rect))
+                        found.add(match_text)
+                page_rects.append(rects)
+            
+            # Pages are independent, so larger documents are split into one run of
+            # pages per CPU; form PDFs stay in-process since their fields are
+            # document-level objects
+            workers = self._page_workers(doc.page_count)
+            if workers > 1 and not doc.is_form_pdf:
+                self._redact_pdf_pages_parallel(doc, input_path, page_rects, color, workers)
+            else:
+                for page, rects in zip(doc, page_rects):
+                    _redact_pdf_page(page, rects, color)
+            
+            doc.save(output_path, garbage=4, deflate=True)
+        finally:
+            doc.close()
         
+        # PII that is not on any page's text layer (scanned pages) is not
+        # removed here, so only a full re-check can validate such output
+        if found.issuperset(match_texts):
+            self._last_check = ("terms", match_texts)
         self._log_redaction(input_path, output_path, pii_data)
         return output_path
     
+    def _redact_pdf_pages_parallel(self, doc, input_path, page_rects, color, workers):
+        """Redact every page of doc with the process pool and splice the results back in."""
+        toc = doc.get_toc(simple=False)
+        page_labels = doc.get_page_labels()
+        
+        page_nums = list(range(doc.page_count))
+        size = -(-len(page_nums) // workers)
+        chunks = [page_nums[i:i + size] for i in range(0, len(page_nums), size)]
+        
+        jobs = [(input_path, chunk, page_rects[chunk[0]:chunk[-1] + 1], color) for chunk in chunks]
+        redacted = list(self._process_pool().map(_redact_pdf_chunk, jobs))
+        
+        links = []
+        for first_page, data, chunk_links in redacted:
+            chunk_doc = fitz.open("pdf", data)
+            try:
+                doc.delete_pages(first_page, first_page + chunk_doc.page_count - 1)
+                doc.insert_pdf(chunk_doc, start_at=first_page, links=False)
+            finally:
+                chunk_doc.close()
+            links.extend(chunk_links)
+        
+        for page, page_links in zip(doc, links):
+            for link in page_links:
+                page.insert_link(link)
+        doc.set_toc(toc)
+        if page_labels:
+            doc.set_page_labels(page_labels)
+    
+    @staticmethod
+    def _page_char_index(page):
+        """Return a page's text and the bounding box of each of its characters."""
+        chars = []
+        char_boxes = []
+        for block in page.get_text("rawdict")["blocks"]:
+            for line in block.get("lines", ()):
+                for span in line["spans"]:
+                    for char in span["chars"]:
+                        chars.append(char["c"])
+                        char_boxes.append(char["bbox"])
+                chars.append("\n")
+                char_boxes.append(None)
+        return "".join(chars), char_boxes
+    
+    @staticmethod
+    def _find_text_rects(page_text, char_boxes, needle):
+        """Yield a rect per line for every occurrence of needle in the page text."""
+        if not needle.strip():
+            return
+        
+        haystack = page_text.lower()
+        if len(haystack) == len(page_text) and len(needle.lower()) == len(needle):
+            needle = needle.lower()
+        else:
+            haystack = page_text
+        
+        start = haystack.find(needle)
+        while start != -1:
+            end = start + len(needle)
+            rect = None
+            for box in char_boxes[start:end]:
+                if box is None:
+                    if rect is not None:
+                        yield rect
+                    rect = None
+                elif rect is None:
+                    rect = fitz.Rect(box)
+                else:
+                    rect.include_rect(box)
+            if rect is not None:
+                yield rect
+            start = haystack.find(needle, end)
+    
+    def _build_term_automaton(self, terms):
+        """Build an Aho-Corasick automaton over the PII strings, or None without pyahocorasick."""
+        if ahocorasick is None or not terms:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for term in terms:
+            automaton.add_word(term, term)
+        automaton.make_automaton()
+        return automaton
+    
+    def _find_terms(self, text, terms, automaton):
+        """Yield ``(start, term)`` for every occurrence of every term, overlapping ones included."""
+        if automaton is not None:
+            for end_index, term in automaton.iter(text):
+                yield end_index - len(term) + 1, term
+            return
+        
+        for term in terms:
+            start = text.find(term)
+            while start != -1:
+                yield start, term
+                start = text.find(term, start + 1)
+    
+    def _mask_terms(self, text, terms, automaton):
+        """Black out the terms in text, or return None when none occur."""
+        occurrences = {}
+        for start, term in self._find_terms(text, terms, automaton):
+            occurrences.setdefault(term, []).append(start)
+        if not occurrences:
+            return None
+        
+        masked = bytearray(len(text))
+        spans = []
+        for term in terms:
+            next_free = 0
+            for start in sorted(occurrences.get(term, ())):
+                end = start + len(term)
+                if start >= next_free and masked.find(1, start, end) == -1:
+                    masked[start:end] = b"\x01" * len(term)
+                    spans.append((start, end))
+                    next_free = end
+        
+        parts = []
+        cursor = 0
+        for start, end in sorted(spans):
+            parts.append(text[cursor:start])
+            parts.append(_block(end - start))
+            cursor = end
+        parts.append(text[cursor:])
+        return "".join(parts)
+    
+    def _write_masked_runs(self, paragraph, redacted):
+        """Copy a masked paragraph text back into the paragraph run by run, or return False."""
+        runs = paragraph.runs
+        run_texts = [run.text for run in runs]
+        if "".join(run_texts) != paragraph.text:
+            return False
+        
+        cursor = 0
+        for run, run_text in zip(runs, run_texts):
+            masked = redacted[cursor:cursor + len(run_text)]
+            if masked != run_text:
+                run.text = masked
+            cursor += len(run_text)
+        return True
+    
+    def _write_masked_cell(self, cell, redacted):
+        """Copy a masked cell text back into the cell's paragraphs run by run, or return False."""
+        cursor = 0
+        for i, paragraph in enumerate(cell.paragraphs):
+            if i:
+                # Paragraphs are joined by newlines in cell.text
+                if redacted[cursor] != "\n":
+                    return False
+                cursor += 1
+            paragraph_text = paragraph.text
+            masked = redacted[cursor:cursor + len(paragraph_text)]
+            if masked != paragraph_text and not self._write_masked_runs(paragraph, masked):
+                return False
+            cursor += len(paragraph_text)
+        return True
+    
     def _redact_word(self, input_path, output_path):
         """Enhanced Word document redaction."""
         text = self.extract_text_from_file(input_path)
         pii_data = self.detect_pii(text)
         
         if not pii_data:
-            import shutil
             shutil.copy2(input_path, output_path)
+            self._last_check = ("terms", [])
             return output_path
         
+        import docx
         doc = docx.Document(input_path)
         
-        # Create replacement mapping
-        replacements = {}
-        for pii_type, matches in pii_data.items():
-            for match in matches:
-                replacements[match["text"]] = "█" * len(match["text"])
+        # Every distinct PII string, in detection order, found with one pass per text
+        terms = list(dict.fromkeys(match["text"] for matches in pii_data.values() for match in matches if match["text"]))
+        automaton = self._build_term_automaton(terms)
         
-        # Replace in paragraphs
+        # Replace in paragraphs, keeping run formatting where possible
         for paragraph in doc.paragraphs:
-            for original, replacement in replacements.items():
-                if original in paragraph.text:
-                    paragraph.text = paragraph.text.replace(original, replacement)
+            redacted = self._mask_terms(paragraph.text, terms, automaton)
+            if redacted is not None and not self._write_masked_runs(paragraph, redacted):
+                paragraph.text = redacted
         
         # Replace in tables
         for table in doc.tables:
             for row in table.rows:
                 for cell in row.cells:
-                    for original, replacement in replacements.items():
-                        if original in cell.text:
-                            cell.text = cell.text.replace(original, replacement)
+                    redacted = self._mask_terms(cell.text, terms, automaton)
+                    if redacted is not None and not self._write_masked_cell(cell, redacted):
+                        cell.text = redacted
         
         doc.save(output_path)
+        self._last_check = ("terms", terms)
         self._log_redaction(input_path, output_path, pii_data)
         return output_path
     
@@ -804,30 +1543,42 @@ class AdvancedPIIRedactor:
         pii_data = self.detect_pii(text)
         
         if not pii_data:
-            import shutil
             shutil.copy2(input_path, output_path)
+            self._last_check = ("terms", [])
             return output_path
         
+        from openpyxl import load_workbook
+        from openpyxl.styles import PatternFill
+        
         workbook = load_workbook(input_path)
         black_fill = PatternFill(start_color="000000", end_color="000000", fill_type="solid")
         
-        # Create replacement mapping
-        replacements = {}
-        for pii_type, matches in pii_data.items():
-            for match in matches:
-                replacements[match["text"]] = "REDACTED"
-        
+        # Every distinct PII string, found with one pass per cell: the
+        # automaton, or else a single alternation of all the strings
+        terms = list(dict.fromkeys(match["text"] for matches in pii_data.values() for match in matches if match["text"]))
+        automaton = self._build_term_automaton(terms)
+        if automaton is not None:
+            def contains_pii(cell_text):
+                return next(automaton.iter(cell_text), None) is not None
+        else:
+            contains_pii = _term_alternation(terms).search
+        
+        # A cell holding any PII string is replaced as a whole. Cells are
+        # scanned by value and only the hits are fetched as cell objects
         for sheet in workbook.worksheets:
-            for row in sheet.iter_rows():
-                for cell in row.cells:
-                    if cell.value:
-                        cell_text = str(cell.value)
-                        for original, replacement in replacements.items():
-                            if original in cell_text:
-                                cell.value = replacement
-                                cell.fill = black_fill
+            hits = [
+                (row_idx, col_idx)
+                for row_idx, row in enumerate(sheet.iter_rows(values_only=True), start=1)
+                for col_idx, value in enumerate(row, start=1)
+                if value and contains_pii(str(value))
+            ]
+            for row_idx, col_idx in hits:
+                cell = sheet.cell(row=row_idx, column=col_idx)
+                cell.value = "REDACTED"
+                cell.fill = black_fill
         
         workbook.save(output_path)
+        self._last_check = ("terms", terms)
         self._log_redaction(input_path, output_path, pii_data)
         return output_path
     
@@ -837,70 +1588,106 @@ class AdvancedPIIRedactor:
         pii_data = self.detect_pii(text)
         
         if not pii_data:
-            import shutil
             shutil.copy2(input_path, output_path)
+            self._last_check = ("terms", [])
             return output_path
         
-        redacted_text = text
-        
-        # Sort matches by position (reverse order to maintain positions)
-        all_matches = []
-        for pii_type, matches in pii_data.items():
-            for match in matches:
-                all_matches.append(match)
-        
-        all_matches.sort(key=lambda x: x["start"], reverse=True)
-        
-        for match in all_matches:
-            start = match["start"]
-            end = match["end"]
-            redacted_text = redacted_text[:start] + "█" * (end - start) + redacted_text[end:]
+        # Sort matches by position and build the output in one forward pass,
+        # merging overlapping matches into a single block
+        spans = sorted((match["start"], match["end"]) for matches in pii_data.values() for match in matches)
         
+        parts = []
+        blocks = []
+        cursor = 0
+        for start, end in spans:
+            if end <= cursor:
+                continue
+            start = max(start, cursor)
+            parts.append(text[cursor:start])
+            parts.append(_block(end - start))
+            blocks.append((start, end))
+            cursor = end
+        parts.append(text[cursor:])
+        redacted_text = "".join(parts)
+        self._last_check = ("spans", blocks)
+        
+        # One write of the whole text: it bypasses the stream buffer, so a
+        # larger buffer or mmap gains nothing, and the text mode keeps the
+        # newline handling the detection offsets were computed with
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(redacted_text)
         
         self._log_redaction(input_path, output_path, pii_data)
         return output_path
     
+    def _ocr_words(self, img):
+        """OCR an image once and return its text with the span and box of every word."""
+        parts = []
+        starts = []
+        ends = []
+        boxes = []
+        cursor = 0
+        prev_line = None
+        for line, word, box in _ocr_word_boxes(img):
+            word = word.strip()
+            if not word:
+                continue
+            if prev_line is not None:
+                parts.append(" " if line == prev_line else "\n")
+                cursor += 1
+            prev_line = line
+            
+            starts.append(cursor)
+            ends.append(cursor + len(word))
+            boxes.append(box)
+            parts.append(word)
+            cursor += len(word)
+        
+        return (
+            "".join(parts),
+            np.array(starts, dtype=np.int64),
+            np.array(ends, dtype=np.int64),
+            np.array(boxes, dtype=np.int64).reshape(-1, 4),
+        )
+    
     def _redact_image(self, input_path, output_path):
         """Enhanced image redaction with OCR-based positioning."""
-        text = self.extract_text_from_file(input_path)
+        img = Image.open(input_path)
+        img.load()
+        # OCR the same binarised grayscale that text extraction reads; it has
+        # the original's geometry, so the word boxes apply to img directly
+        text, word_starts, word_ends, word_boxes = self._ocr_words(self._preprocess_image_for_ocr(img))
         pii_data = self.detect_pii(text)
         
         if not pii_data:
-            import shutil
+            img.close()
             shutil.copy2(input_path, output_path)
+            self._last_check = ("terms", [])
             return output_path
         
-        # Load image
-        img = Image.open(input_path)
-        draw = ImageDraw.Draw(img)
+        matches = [match for matches in pii_data.values() for match in matches]
+        match_starts = np.fromiter((match["start"] for match in matches), dtype=np.int64, count=len(matches))
+        match_ends = np.fromiter((match["end"] for match in matches), dtype=np.int64, count=len(matches))
+        
+        # Words are in text order, so each match covers the words from the
+        # first ending after its start up to the first starting at its end.
+        # The ranges are summed into a difference array, so a word that
+        # several matches overlap is still drawn once
+        first = np.searchsorted(word_ends, match_starts, side="right")
+        stop = np.searchsorted(word_starts, match_ends, side="left")
+        marks = np.zeros(len(word_starts) + 1, dtype=np.int64)
+        np.add.at(marks, first, 1)
+        np.add.at(marks, stop, -1)
+        covered = np.cumsum(marks[:-1]) > 0
         
-        # Get OCR data with bounding boxes
-        ocr_data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
-        
-        # Create mapping of text to bounding boxes
-        text_boxes = {}
-        for i, word in enumerate(ocr_data['text']):
-            if word.strip():
-                x = ocr_data['left'][i]
-                y = ocr_data['top'][i]
-                w = ocr_data['width'][i]
-                h = ocr_data['height'][i]
-                text_boxes[word] = (x, y, x + w, y + h)
-        
-        # Redact identified PII
-        for pii_type, matches in pii_data.items():
-            for match in matches:
-                match_text = match["text"]
-                
-                # Find matching text in OCR results
-                for word, box in text_boxes.items():
-                    if match_text in word or word in match_text:
-                        draw.rectangle(box, fill="black")
+        draw = ImageDraw.Draw(img)
+        drawn = [tuple(box) for box in word_boxes[covered].tolist()]
+        for box in drawn:
+            draw.rectangle(box, fill="black")
         
         # Save redacted image
         img.save(output_path)
+        self._last_check = ("boxes", drawn)
         self._log_redaction(input_path, output_path, pii_data)
         return output_path
     
@@ -912,48 +1699,123 @@ class AdvancedPIIRedactor:
             "output_file": output_path,
             "pii_detected": {k: len(v) for k, v in pii_data.items()},
             "total_pii_count": sum(len(v) for v in pii_data.values()),
-            "pii_details": {k: [{"text": "***REDACTED***", "confidence": m["confidence"]} for m in v] for k, v in pii_data.items()}
+            # Confidence of each redacted match per type; the text itself is never logged
+            "pii_details": {k: [m["confidence"] for m in v] for k, v in pii_data.items()}
         }
         
-        self.redaction_log.append(log_entry)
+        self._record_log_entry(log_entry)
         logger.info(f"Redacted {log_entry['total_pii_count']} PII instances from {input_path}")
     
-    def get_redaction_summary(self):
+    def _record_log_entry(self, log_entry):
+        """Add a log entry to the running totals and to the log."""
+        self._files_logged += 1
+        self._pii_logged.update(log_entry["pii_detected"])
+        self._last_log_entry = log_entry
+        
+        if self._log_path is None:
+            self.redaction_log.append(log_entry)
+        else:
+            with open(self._log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(log_entry, default=str) + "\n")
+    
+    def get_redaction_summary(self, include_log=False):
         """Get comprehensive summary of all redactions performed."""
-        if not self.redaction_log:
+        if not self._files_logged:
             return {"message": "No redactions performed yet"}
         
         summary = {
-            "total_files_processed": len(self.redaction_log),
-            "total_pii_redacted": sum(log["total_pii_count"] for log in self.redaction_log),
-            "pii_types_found": {},
-            "redaction_log": self.redaction_log
+            "total_files_processed": self._files_logged,
+            "total_pii_redacted": sum(self._pii_logged.values()),
+            "pii_types_found": dict(self._pii_logged),
         }
-        
-        # Aggregate PII types
-        for log in self.redaction_log:
-            for pii_type, count in log["pii_detected"].items():
-                if pii_type not in summary["pii_types_found"]:
-                    summary["pii_types_found"][pii_type] = 0
-                summary["pii_types_found"][pii_type] += count
+        if include_log:
+            summary["redaction_log"] = list(self.get_redaction_log())
         
         return summary
     
+    def get_redaction_log(self):
+        """Yield the logged redaction entries, read back from ``log_path`` when one is configured."""
+        if self._log_path is None:
+            yield from self.redaction_log
+            return
+        
+        try:
+            with open(self._log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            return
+    
     def validate_redaction_quality(self, original_path, redacted_path):
         """Validate redaction quality by checking for PII remnants."""
+        check = self._redaction_checks.pop(str(redacted_path), None)
         try:
-            redacted_text = self.extract_text_from_file(redacted_path)
-            remaining_pii = self.detect_pii(redacted_text)
-            
-            if remaining_pii:
-                logger.warning(f"Potential PII remnants found in redacted file: {remaining_pii}")
-                return False
+            if check is None:
+                redacted_text = self.extract_text_from_file(redacted_path)
+                remaining_pii = self.detect_pii(redacted_text)
+                
+                if remaining_pii:
+                    logger.warning(f"Potential PII remnants found in redacted file: {remaining_pii}")
+                    return False
+                
+                return True
             
-            return True
+            kind, expected = check
+            if not expected:
+                # Nothing was detected, so the output is an unmodified copy
+                return True
+            if kind == "boxes":
+                return self._boxes_are_blacked_out(redacted_path, expected)
+            if kind == "spans":
+                return self._spans_are_blocked(redacted_path, expected)
+            return self._terms_are_removed(redacted_path, expected)
         except Exception as e:
             logger.error(f"Error validating redaction quality: {e}")
             return False
-
+    
+    def _spans_are_blocked(self, redacted_path, spans):
+        """Return True if every redacted span of a text file holds only blocks."""
+        redacted_text = self._extract_from_text(redacted_path) or ""
+        for start, end in spans:
+            if redacted_text[start:end] != _block(end - start):
+                logger.warning(f"Potential PII remnants found in redacted file: characters {start}-{end} are not redacted")
+                return False
+        return True
+    
+    def _terms_are_removed(self, redacted_path, terms):
+        """Return True if none of the redacted PII strings is left in the output's text."""
+        if Path(redacted_path).suffix.lower() == '.pdf':
+            # Only the text layer was redacted, and it is compared the way
+            # _find_text_rects matched it
+            doc = fitz.open(redacted_path)
+            try:
+                redacted_text = "".join(page.get_text() for page in doc).lower()
+            finally:
+                doc.close()
+            terms = [term.lower() for term in terms]
+        else:
+            redacted_text = self.extract_text_from_file(redacted_path) or ""
+        
+        remaining = [term for term in terms if term and term in redacted_text]
+        if remaining:
+            logger.warning(f"Potential PII remnants found in redacted file: {len(remaining)} redacted strings still present")
+            return False
+        return True
+    
+    def _boxes_are_blacked_out(self, redacted_path, boxes):
+        """Return True if every redaction box in the output image is black."""
+        gray = np.asarray(Image.open(redacted_path).convert("L"))
+        for left, top, right, bottom in boxes:
+            region = gray[max(top, 0):bottom, max(left, 0):right]
+            if not region.size:
+                logger.warning(f"Cannot validate redaction: box {(left, top, right, bottom)} covers no pixels")
+                return False
+            # Allow for compression noise around the edges of lossy formats
+            if region.mean() > 5:
+                logger.warning(f"Potential PII remnants found in redacted file: box {(left, top, right, bottom)} is not blacked out")
+                return False
+        return True
 
 def ensure_proper_extension(file_path):
     """Ensure file has proper extension format."""
@@ -963,52 +1825,122 @@ def ensure_proper_extension(file_path):
     return str(path)
 
 
-def main():
-    """Main function for CLI and API usage."""
-    if len(sys.argv) < 2:
-        print("Usage: python advanced_pii_redactor.py <input_file> [output_file]")
-        sys.exit(1)
-    
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else None
-    if output_file:
-        output_file = ensure_proper_extension(output_file)
-    
+# The redactor of the current process, built by _redact_one on first use
+_worker_redactor = None
+
+
+def _redact_one(args):
+    """Redact one file and validate the result, returning the outcome as a dict."""
+    global _worker_redactor
+    input_file, output_file, page_workers = args
     try:
         # Initialize redactor
-        redactor = AdvancedPIIRedactor()
+        if _worker_redactor is None:
+            _worker_redactor = AdvancedPIIRedactor()
+        redactor = _worker_redactor
+        redactor.config["page_workers"] = page_workers
+        redactor._last_log_entry = None
         
         # Perform redaction
-        result = redactor.redact_file(input_file, output_file)
+        result = redactor.redact_file(input_file, output_file, validate=True)
         
         # Validate redaction quality
         is_valid = redactor.validate_redaction_quality(input_file, result)
         
-        # Print results
-        print(f"Redacted file saved to: {result}")
-        print(f"Redaction quality validated: {'✓' if is_valid else '✗'}")
-        
-        # Print summary
-        summary = redactor.get_redaction_summary()
-        print(f"Total PII instances redacted: {summary['total_pii_redacted']}")
-        print(f"PII types found: {list(summary['pii_types_found'].keys())}")
+        # The redactor's totals span every file it handled, so summarise this one from its log entry
+        log_entry = redactor._last_log_entry
+        if log_entry is None:
+            summary = {"message": "No redactions performed yet"}
+        else:
+            summary = {
+                "total_files_processed": 1,
+                "total_pii_redacted": log_entry["total_pii_count"],
+                "pii_types_found": dict(log_entry["pii_detected"]),
+            }
         
         # Return success for API integration
         return {
             "success": True,
+            "input_file": input_file,
             "output_file": result,
             "summary": summary,
             "validation_passed": is_valid
         }
         
     except Exception as e:
-        logger.error(f"Error: {e}")
-        print(f"Error: {e}")
+        logger.error(f"Error redacting {input_file}: {e}")
         return {
             "success": False,
+            "input_file": input_file,
             "error": str(e)
         }
 
 
+def redact_directory(input_dir, output_dir=None):
+    """Redact every supported file under input_dir with a pool of worker processes."""
+    jobs = []
+    for path in sorted(Path(input_dir).rglob("*")):
+        if not path.is_file() or path.suffix.lower() not in SUPPORTED_FORMATS:
+            continue
+        output_file = None
+        if output_dir:
+            output_path = Path(output_dir) / path.relative_to(input_dir)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_file = str(output_path)
+        # Files already run in parallel, so each one keeps its pages in-process
+        jobs.append((str(path), output_file, 1))
+    
+    workers = int(os.environ.get("REDACT_WORKERS", (os.cpu_count() or 2) - 1))
+    workers = max(1, min(workers, len(jobs)))
+    if workers > 1:
+        with multiprocessing.Pool(workers, initializer=_init_ocr_worker) as pool:
+            return pool.map(_redact_one, jobs)
+    return [_redact_one(job) for job in jobs]
+
+
+def main():
+    """Main function for CLI and API usage."""
+    if len(sys.argv) < 2:
+        print("Usage: python advanced_pii_redactor.py <input_file|input_dir> [output_file|output_dir]")
+        sys.exit(1)
+    
+    input_file = sys.argv[1]
+    output_file = sys.argv[2] if len(sys.argv) > 2 else None
+    
+    if os.path.isdir(input_file):
+        results = redact_directory(input_file, output_file)
+        for result in results:
+            if result["success"]:
+                print(f"Redacted file saved to: {result['output_file']} (validated: {'✓' if result['validation_passed'] else '✗'})")
+            else:
+                print(f"Error: {result['input_file']}: {result['error']}")
+        
+        print(f"Files redacted: {sum(result['success'] for result in results)}/{len(results)}")
+        print(f"Total PII instances redacted: {sum(result['summary'].get('total_pii_redacted', 0) for result in results if result['success'])}")
+        return {
+            "success": all(result["success"] for result in results),
+            "results": results
+        }
+    
+    if output_file:
+        output_file = ensure_proper_extension(output_file)
+    
+    result = _redact_one((input_file, output_file, None))
+    
+    # Print results
+    if result["success"]:
+        print(f"Redacted file saved to: {result['output_file']}")
+        print(f"Redaction quality validated: {'✓' if result['validation_passed'] else '✗'}")
+        
+        # Print summary
+        summary = result["summary"]
+        print(f"Total PII instances redacted: {summary.get('total_pii_redacted', 0)}")
+        print(f"PII types found: {list(summary.get('pii_types_found', {}).keys())}")
+    else:
+        print(f"Error: {result['error']}")
+    
+    return result
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,220 @@
+"""Redacted documents keep their structure and lose their PII."""
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import docx
+import fitz
+from docx.opc.constants import RELATIONSHIP_TYPE
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from PIL import Image, ImageDraw
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / "lib" / "API")]
+
+import PDF_IMG_to_TXT  # noqa: E402
+
+PAN = "ABCDE1234F"
+AADHAAR_DIGITS = ["2345", "6789", "0124"]
+
+
+class RedactorTestCase(unittest.TestCase):
+    """Base class with a pattern-only redactor and a scratch directory."""
+
+    config = {}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.redactor = PDF_IMG_to_TXT.AdvancedPIIRedactor()
+        cls.redactor.nlp = None
+        cls.redactor.config.update(cls.config)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.redactor.close()
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+
+class ParallelPdfRedactionTest(RedactorTestCase):
+    """Pages redacted in worker processes are spliced back without losing document-level objects."""
+
+    config = {"page_workers": 3}
+
+    def _make_pdf(self, path):
+        doc = fitz.open()
+        for number in range(6):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Page {number + 1} PAN number: {PAN}")
+        # Links within a run and across runs of pages
+        for source, target in [(0, 5), (2, 3), (4, 1)]:
+            doc[source].insert_link({"kind": fitz.LINK_GOTO, "from": fitz.Rect(72, 100, 200, 120), "page": target})
+        doc[1].insert_link({"kind": fitz.LINK_URI, "from": fitz.Rect(72, 100, 200, 120), "uri": "https://example.com/"})
+        doc.set_toc([[1, "Start", 1], [2, "Middle", 3], [1, "End", 6]])
+        doc.set_page_labels([{"startpage": 0, "prefix": "A-", "style": "D", "firstpagenum": 1}])
+        doc.save(path)
+        doc.close()
+
+    @staticmethod
+    def _links(doc):
+        return [
+            [(link["kind"], link.get("page"), link.get("uri")) for link in page.get_links()]
+            for page in doc
+        ]
+
+    def test_structure_survives_page_splice(self):
+        input_path = self.tmp / "in.pdf"
+        output_path = self.tmp / "out.pdf"
+        self._make_pdf(input_path)
+
+        self.redactor.redact_file(str(input_path), str(output_path))
+
+        with fitz.open(input_path) as original, fitz.open(output_path) as redacted:
+            self.assertEqual(redacted.page_count, 6)
+            self.assertEqual(redacted.get_toc(), original.get_toc())
+            self.assertEqual(redacted.get_page_labels(), original.get_page_labels())
+            self.assertEqual([page.get_label() for page in redacted], [f"A-{n}" for n in range(1, 7)])
+            self.assertEqual(self._links(redacted), self._links(original))
+            for page in redacted:
+                self.assertNotIn(PAN, page.get_text())
+
+
+class WordRedactionTest(RedactorTestCase):
+    """PII is masked in Word documents, run by run where the runs allow it."""
+
+    @staticmethod
+    def _add_hyperlink(paragraph, url, text):
+        hyperlink = OxmlElement("w:hyperlink")
+        hyperlink.set(qn("r:id"), paragraph.part.relate_to(url, RELATIONSHIP_TYPE.HYPERLINK, is_external=True))
+        run = OxmlElement("w:r")
+        text_element = OxmlElement("w:t")
+        text_element.text = text
+        run.append(text_element)
+        hyperlink.append(run)
+        paragraph._p.append(hyperlink)
+
+    def _redact(self, doc):
+        input_path = self.tmp / "in.docx"
+        output_path = self.tmp / "out.docx"
+        doc.save(input_path)
+        self.redactor.redact_file(str(input_path), str(output_path))
+        return docx.Document(output_path)
+
+    def assertNoAadhaar(self, text):
+        for digits in AADHAAR_DIGITS:
+            self.assertNotIn(digits, text)
+
+    def test_match_split_across_runs_keeps_formatting(self):
+        doc = docx.Document()
+        paragraph = doc.add_paragraph()
+        paragraph.add_run("Aadhaar: ").bold = True
+        paragraph.add_run("2345 67")
+        paragraph.add_run("89 0124").italic = True
+        paragraph.add_run(" verified")
+
+        paragraph = self._redact(doc).paragraphs[0]
+
+        self.assertEqual([run.text for run in paragraph.runs], ["Aadhaar: ", "█" * 7, "█" * 7, " verified"])
+        self.assertEqual([(run.bold, run.italic) for run in paragraph.runs], [(True, None), (None, None), (None, True), (None, None)])
+
+    def test_hyperlink_paragraph_is_rewritten_whole(self):
+        doc = docx.Document()
+        paragraph = doc.add_paragraph("Aadhaar ")
+        self._add_hyperlink(paragraph, "https://example.com/", "2345 6789 0124")
+        paragraph.add_run(" linked")
+
+        redacted = self._redact(doc)
+
+        self.assertEqual(redacted.paragraphs[0].text, "Aadhaar " + "█" * 14 + " linked")
+        self.assertNoAadhaar(redacted.element.xml)
+
+    def test_match_spanning_cell_paragraphs(self):
+        doc = docx.Document()
+        paragraph = doc.add_paragraph("Aadhaar 2345 6789")
+        paragraph.add_run().add_break()
+        paragraph.add_run("0124")
+        cell = doc.add_table(rows=1, cols=2).cell(0, 1)
+        cell.text = "2345 6789"
+        cell.add_paragraph("0124")
+
+        redacted = self._redact(doc)
+
+        # The masked newline cannot be split between paragraphs, so the cell is rewritten whole
+        self.assertEqual(redacted.tables[0].cell(0, 1).text, "█" * 14)
+        self.assertEqual(redacted.paragraphs[0].text, "Aadhaar " + "█" * 14)
+        self.assertNoAadhaar(redacted.element.xml)
+
+
+
+class ValidationTest(RedactorTestCase):
+    """validate_redaction_quality accepts redacted outputs and rejects ones that still hold PII."""
+
+    # OCR result for the test image, so no Tesseract is needed
+    WORDS = [
+        (1, "Aadhaar", (10, 10, 90, 30)),
+        (1, "2345", (100, 10, 140, 30)),
+        (1, "6789", (150, 10, 190, 30)),
+        (1, "0124", (200, 10, 240, 30)),
+        (2, "verified", (10, 40, 90, 60)),
+    ]
+
+    def _check(self, input_path):
+        output_path = self.tmp / f"out{input_path.suffix}"
+
+        self.redactor.redact_file(str(input_path), str(output_path), validate=True)
+        self.assertTrue(self.redactor.validate_redaction_quality(str(input_path), str(output_path)))
+
+        # An output that still holds the PII fails the same check
+        self.redactor.redact_file(str(input_path), str(output_path), validate=True)
+        shutil.copy(input_path, output_path)
+        self.assertFalse(self.redactor.validate_redaction_quality(str(input_path), str(output_path)))
+
+    def test_pdf(self):
+        input_path = self.tmp / "in.pdf"
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), f"PAN number: {PAN}")
+        doc.save(input_path)
+        doc.close()
+        self._check(input_path)
+
+    def test_pdf_without_stored_check(self):
+        input_path = self.tmp / "in.pdf"
+        output_path = self.tmp / "out.pdf"
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), f"PAN number: {PAN}")
+        doc.save(input_path)
+        doc.close()
+
+        # Without validate the output is re-extracted and scanned for PII
+        self.redactor.redact_file(str(input_path), str(output_path))
+        self.assertTrue(self.redactor.validate_redaction_quality(str(input_path), str(output_path)))
+        self.assertFalse(self.redactor.validate_redaction_quality(str(input_path), str(input_path)))
+
+    def test_word(self):
+        input_path = self.tmp / "in.docx"
+        doc = docx.Document()
+        doc.add_paragraph("Aadhaar 2345 6789 0124 verified")
+        doc.save(input_path)
+        self._check(input_path)
+
+    def test_image(self):
+        input_path = self.tmp / "in.png"
+        img = Image.new("RGB", (260, 70), "white")
+        draw = ImageDraw.Draw(img)
+        for _, word, (left, top, right, bottom) in self.WORDS:
+            draw.text((left, top), word, fill="black")
+        img.save(input_path)
+
+        with mock.patch.object(PDF_IMG_to_TXT, "_ocr_word_boxes", lambda img: iter(self.WORDS)):
+            self._check(input_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""The multi-pattern screens must never drop PII that a plain ``re`` scan finds."""
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / "lib" / "API"), str(ROOT)]
+
+import PDF_IMG_to_TXT  # noqa: E402
+
+try:
+    import abcd
+except ImportError:  # abcd.py needs ocrmypdf and pandas
+    abcd = None
+
+# ASCII separators that re's \s matches but Hyperscan's and RE2's do not
+SEPARATORS = ["\x0b", "\x1c", "\x1d", "\x1e", "\x1f"]
+
+SAMPLES = [
+    "Aadhaar 2345{sep}6789{sep}0124",
+    "Call me on +91{sep}9876543210 or 98765{sep}43210",
+    "Card 4111{sep}1111{sep}1111{sep}1111",
+    "Age:{sep}34{sep}years",
+]
+
+
+def _texts():
+    for sep in SEPARATORS:
+        for sample in SAMPLES:
+            yield sample.format(sep=sep)
+
+
+class PatternScreenTest(unittest.TestCase):
+    """PDF_IMG_to_TXT.AdvancedPIIRedactor with each available screening engine."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.redactor = PDF_IMG_to_TXT.AdvancedPIIRedactor()
+        cls.redactor.nlp = None
+
+    def _detect_unscreened(self, text):
+        with mock.patch.object(self.redactor, "_pattern_scanner", None):
+            return self.redactor.detect_pii(text)
+
+    def _check_engine(self, engine):
+        if getattr(PDF_IMG_to_TXT, engine) is None:
+            self.skipTest(f"{engine} is not installed")
+        other = {"hyperscan": "re2", "re2": "hyperscan"}[engine]
+        with mock.patch.object(PDF_IMG_to_TXT, other, None):
+            scanner = self.redactor._build_pattern_scanner()
+        with mock.patch.multiple(self.redactor, _pattern_scanner=scanner[0], _scanned_ids=scanner[1]):
+            for text in _texts():
+                with self.subTest(text=text):
+                    self.assertEqual(self.redactor.detect_pii(text), self._detect_unscreened(text))
+
+    def test_separated_aadhaar_is_detected(self):
+        detected = self.redactor.detect_pii("Aadhaar 2345\x1c6789\x1c0124")
+        self.assertEqual([match["text"] for match in detected.get("AADHAAR", [])], ["2345\x1c6789\x1c0124"])
+
+    def test_hyperscan_screen(self):
+        self._check_engine("hyperscan")
+
+    def test_re2_screen(self):
+        self._check_engine("re2")
+
+
+@unittest.skipIf(abcd is None, "abcd.py dependencies are not installed")
+class MasterScanTest(unittest.TestCase):
+    """abcd.AdvancedPIIRedactor with RE2 and Hyperscan against plain re."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.redactor = abcd.AdvancedPIIRedactor()
+        cls.redactor.nlp = None
+
+    def _detect_with_re(self, text):
+        with mock.patch.object(abcd, "re2", None), mock.patch.object(self.redactor, "_hs_db", None):
+            return self.redactor.detect_pii(text)
+
+    def test_re2_master_scan(self):
+        if abcd.re2 is None:
+            self.skipTest("re2 is not installed")
+        with mock.patch.object(self.redactor, "_hs_db", None):
+            for text in _texts():
+                with self.subTest(text=text):
+                    self.assertEqual(self.redactor.detect_pii(text), self._detect_with_re(text))
+
+    def test_hyperscan_screen(self):
+        if self.redactor._hs_db is None:
+            self.skipTest("hyperscan is not installed")
+        with mock.patch.object(abcd, "re2", None):
+            for text in _texts():
+                with self.subTest(text=text):
+                    self.assertEqual(self.redactor.detect_pii(text), self._detect_with_re(text))
+
+    def test_numbered_account_labels(self):
+        texts = [
+            "Account No. 1: 123456789012",
+            "Savings a/c no 2: 123456789012",
+            "123456789012 is acct 3",
+        ]
+        for text in texts:
+            for detect in (self.redactor.detect_pii, self._detect_with_re):
+                with self.subTest(text=text, detect=detect.__name__):
+                    detected = detect(text)
+                    self.assertEqual([match["text"] for match in detected.get("BANK_ACCOUNT", [])], ["123456789012"])
+
+
+if __name__ == "__main__":
+    unittest.main()